@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 # Из модуля models импортируем модель Category...
-from .models import Category, Comment, Location, Post
+from .models import AuthorStats, Category, Comment, Location, Post
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -59,6 +59,8 @@ class LocationAdmin(admin.ModelAdmin):
     )
     list_display = (
         'name',
+        'latitude',
+        'longitude',
         'is_published',
         'created_at',
     )
@@ -79,7 +81,20 @@ class CommentAdmin(admin.ModelAdmin):
     list_display_links = ('author',)
 
 
+class AuthorStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'author',
+        'post_count',
+        'published_post_count',
+        'comment_count',
+        'last_post_date',
+    )
+    readonly_fields = list_display
+    search_fields = ('author__username',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(AuthorStats, AuthorStatsAdmin)
@@ -5,3 +5,10 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import checks, instrumentation, querylog, signals  # noqa
+        from .db_backends import connection_stats
+
+        instrumentation.register('db_connections', connection_stats.snapshot)
+        instrumentation.register('sql_fingerprints', querylog.snapshot)
@@ -0,0 +1,97 @@
+"""Асинхронные (ASGI) варианты представлений ленты.
+
+Django 3.2 не умеет асинхронно обращаться к ORM и кэшу, поэтому вся
+работа с БД выполняется за один переход в поток (``sync_to_async``):
+кверисеты вычисляются, пользователь из сессии загружается заранее.
+Шаблон затем рендерится прямо в цикле событий, без второго перехода,
+который делает ASGI-обработчик для синхронных представлений.
+
+Включаются настройкой ``ASYNC_FEED_VIEWS``.
+"""
+
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.decorators import classonlymethod
+from django.views.generic.detail import BaseDetailView
+from django.views.generic.list import BaseListView
+
+from .views import (
+    CategoryListView,
+    PostDetailView,
+    PostsListView,
+    ProfileDetailView,
+)
+
+
+class AsyncReadViewMixin:
+    """Миксин, превращающий GET-представление для чтения в корутину."""
+
+    def load_context(self):
+        """Выполняет все запросы к БД и возвращает готовый контекст."""
+        # Загружаем пользователя из сессии, пока находимся в потоке.
+        self.request.user.is_authenticated
+        if isinstance(self, BaseDetailView):
+            self.object = self.get_object()
+            context = self.get_context_data(object=self.object)
+            if 'comments' in context:
+                context['comments'] = list(context['comments'])
+            return context
+        if isinstance(self, BaseListView):
+            self.object_list = self.get_queryset()
+            context = self.get_context_data()
+            page = context.get('page_obj')
+            if page is not None:
+                page.object_list = list(page.object_list)
+                object_list = page.object_list
+            else:
+                object_list = list(context['object_list'])
+            context['object_list'] = object_list
+            context_object_name = self.get_context_object_name(
+                self.object_list
+            )
+            if context_object_name is not None:
+                context[context_object_name] = object_list
+            return context
+        raise TypeError(
+            f'{type(self).__name__} не является представлением для чтения.'
+        )
+
+    async def get(self, request, *args, **kwargs):
+        context = await sync_to_async(self.load_context)()
+        content = render_to_string(
+            self.get_template_names(), context, request
+        )
+        return HttpResponse(content)
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):  # noqa: N805
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            if request.method not in ('GET', 'HEAD'):
+                return self.http_method_not_allowed(request, *args, **kwargs)
+            return await self.get(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        update_wrapper(view, cls, updated=())
+        return view
+
+
+class AsyncPostsListView(AsyncReadViewMixin, PostsListView):
+    """Асинхронный список всех постов."""
+
+
+class AsyncCategoryListView(AsyncReadViewMixin, CategoryListView):
+    """Асинхронный список постов категории."""
+
+
+class AsyncProfileDetailView(AsyncReadViewMixin, ProfileDetailView):
+    """Асинхронный профиль пользователя."""
+
+
+class AsyncPostDetailView(AsyncReadViewMixin, PostDetailView):
+    """Асинхронная страница поста."""
@@ -0,0 +1,51 @@
+"""Бэкенды аутентификации."""
+
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth import middleware
+from django.contrib.auth.backends import ModelBackend
+from django.utils.functional import SimpleLazyObject
+
+from .caching import get_cached_user, shared_cache
+
+CACHED_BACKEND = 'blog.backends.CachedModelBackend'
+# Бэкенды, записанные в сессии до включения кэша пользователей.
+LEGACY_BACKENDS = ('django.contrib.auth.backends.ModelBackend',)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, берущий пользователя сессии из кэша.
+
+    AuthenticationMiddleware вызывает ``get_user`` на каждом запросе;
+    кэш снимает запрос к auth_user с большинства страниц. Кэш
+    сбрасывается сигналами при любом сохранении пользователя,
+    в том числе при смене пароля и редактировании профиля.
+
+    С кэшем своим у каждого процесса (locmem, dummy) сброс не виден
+    другим воркерам, поэтому пользователь читается из БД, как в
+    ModelBackend.
+    """
+
+    def get_user(self, user_id):
+        if not shared_cache():
+            return super().get_user(user_id)
+        user = get_cached_user(user_id)
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_user(request):
+    """Пользователь сессии; сессии ModelBackend переводятся на кэш.
+
+    ModelBackend не входит в AUTHENTICATION_BACKENDS: иначе неудачный
+    вход проверял бы пароль дважды.
+    """
+    if request.session.get(BACKEND_SESSION_KEY) in LEGACY_BACKENDS:
+        request.session[BACKEND_SESSION_KEY] = CACHED_BACKEND
+    return middleware.get_user(request)
+
+
+class AuthenticationMiddleware(middleware.AuthenticationMiddleware):
+    """AuthenticationMiddleware, принимающий сессии до включения кэша."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -0,0 +1,117 @@
+"""Кэш пользователей, публичных профилей и страниц-каталогов."""
+
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .checks import PER_PROCESS_CACHES
+from .models import User
+
+USER_KEY = 'blog:user:{}'
+PROFILE_KEY = 'blog:profile:{}'
+DIRECTORY_KEY = 'blog:directory:{}'
+
+
+# Хэш пароля в кэш не попадает: у пользователя из кэша поле отложено
+# и при обращении читается из БД.
+SECRET_FIELDS = ('password',)
+
+
+def user_to_cache(user):
+    """Поля пользователя без пароля и хэш для проверки сессии."""
+    return {
+        'fields': {
+            field.attname: getattr(user, field.attname)
+            for field in User._meta.concrete_fields
+            if field.attname not in SECRET_FIELDS
+        },
+        'session_auth_hash': user.get_session_auth_hash(),
+    }
+
+
+def session_auth_hash(user, cached_hash):
+    if 'password' in user.__dict__:
+        return User.get_session_auth_hash(user)
+    return cached_hash
+
+
+def user_from_cache(data):
+    fields = data['fields']
+    user = User.from_db(
+        User._default_manager.db, list(fields), list(fields.values())
+    )
+    # Django сверяет сессию с get_session_auth_hash(), который читает
+    # password; пока пароль не загружен, отдаётся хэш из кэша.
+    user.get_session_auth_hash = partial(
+        session_auth_hash, user, data['session_auth_hash']
+    )
+    return user
+
+
+def shared_cache():
+    """Сброс ключей виден всем воркерам: кэш не locmem и не dummy."""
+    return settings.CACHES['default']['BACKEND'] not in PER_PROCESS_CACHES
+
+
+def get_cached_user(user_id):
+    """Пользователь по id из кэша; при промахе — из БД."""
+    key = USER_KEY.format(user_id)
+    data = cache.get(key)
+    if data is not None:
+        return user_from_cache(data)
+    user = User._default_manager.filter(pk=user_id).first()
+    if user is not None:
+        cache.set(key, user_to_cache(user), settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_profile_or_404(username):
+    """Пользователь для страницы профиля по username.
+
+    С кэшем своим у каждого процесса профиль читается из БД: после
+    правки другие воркеры отдавали бы устаревшую страницу.
+    """
+    shared = shared_cache()
+    key = PROFILE_KEY.format(username)
+    data = cache.get(key) if shared else None
+    if data is not None:
+        return user_from_cache(data)
+    user = User._default_manager.filter(username=username).first()
+    if user is None:
+        raise Http404('Пользователь не найден.')
+    if shared:
+        cache.set(key, user_to_cache(user), settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(user, *usernames):
+    """Сбрасывает кэш пользователя и его профиля (в т.ч. по старым именам)."""
+    cache.delete_many([
+        USER_KEY.format(user.pk),
+        *(PROFILE_KEY.format(name) for name in {user.username, *usernames}),
+    ])
+
+
+def get_directory(stats_model):
+    """Строки каталога (CategoryStats или LocationStats) одним запросом.
+
+    Берутся только опубликованные категории или местоположения вместе
+    с последним постом; результат кэшируется до изменения счётчиков.
+    """
+    key = DIRECTORY_KEY.format(stats_model._meta.model_name)
+    rows = cache.get(key)
+    if rows is None:
+        item = stats_model._meta.pk.name
+        rows = list(
+            stats_model.objects
+            .filter(**{f'{item}__is_published': True})
+            .select_related(item, 'latest_post')
+        )
+        cache.set(key, rows, settings.DIRECTORY_CACHE_TIMEOUT)
+    return rows
+
+
+def invalidate_directory(stats_model):
+    cache.delete(DIRECTORY_KEY.format(stats_model._meta.model_name))
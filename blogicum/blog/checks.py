@@ -0,0 +1,102 @@
+"""Системные проверки настроек, мешающих производительности.
+
+Проверки относятся к развёртыванию и запускаются командой
+``python manage.py check --deploy --tag performance``.
+"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PERFORMANCE = 'performance'
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+
+
+@register(PERFORMANCE, deploy=True)
+def check_debug(app_configs, **kwargs):
+    errors = []
+    if settings.DEBUG:
+        errors.append(Warning(
+            'DEBUG включён: каждый SQL-запрос сохраняется в памяти '
+            'процесса (connection.queries), страницы ошибок собирают '
+            'полный контекст.',
+            hint='Задайте DJANGO_ENV=production или DJANGO_DEBUG=0.',
+            id='blog.W001',
+        ))
+    if 'debug_toolbar' in settings.INSTALLED_APPS:
+        errors.append(Warning(
+            'Подключён debug_toolbar: он замедляет запуск воркера '
+            'и оборачивает каждый запрос.',
+            hint='Задайте DEV_TOOLS=0.',
+            id='blog.W002',
+        ))
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Warning(
+        f'Кэш по умолчанию ({backend}) свой у каждого процесса: сброс '
+        'кэша сигналами не виден другим воркерам, а каждый воркер '
+        'заполняет кэш заново.',
+        hint='Задайте CACHE_BACKEND=file или CACHE_BACKEND=memcached.',
+        id='blog.W003',
+    )]
+
+
+@register(PERFORMANCE, deploy=True)
+def check_databases(app_configs, **kwargs):
+    errors = []
+    for alias, database in settings.DATABASES.items():
+        if database.get('CONN_MAX_AGE', 0) == 0:
+            errors.append(Warning(
+                f'БД {alias}: CONN_MAX_AGE=0, соединение открывается '
+                'заново на каждый запрос.',
+                hint='Задайте DB_CONN_MAX_AGE, например 60.',
+                id='blog.W004',
+            ))
+        journal_mode = database.get('PRAGMAS', {}).get('journal_mode', '')
+        if 'sqlite3' in database['ENGINE'] and journal_mode.lower() != 'wal':
+            errors.append(Warning(
+                f'БД {alias}: SQLite без журнала WAL, запись блокирует '
+                'чтение во всех воркерах.',
+                hint="Добавьте 'PRAGMAS': {'journal_mode': 'wal'}.",
+                id='blog.W005',
+            ))
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_templates(app_configs, **kwargs):
+    errors = []
+    for template in settings.TEMPLATES:
+        loaders = template.get('OPTIONS', {}).get('loaders', [])
+        if template['BACKEND'].endswith('DjangoTemplates') and not any(
+            isinstance(loader, (list, tuple)) and loader[0] == CACHED_LOADER
+            for loader in loaders
+        ):
+            errors.append(Warning(
+                'Шаблоны компилируются заново при каждом рендеринге: '
+                'cached.Loader не подключён.',
+                hint='Задайте TEMPLATE_CACHE=1.',
+                id='blog.W006',
+            ))
+    return errors
+
+
+@register(PERFORMANCE, deploy=True)
+def check_sessions(app_configs, **kwargs):
+    if settings.SESSION_ENGINE != 'django.contrib.sessions.backends.db':
+        return []
+    return [Warning(
+        'Сессии хранятся только в БД: каждый запрос с cookie сессии '
+        'стоит запроса к django_session.',
+        hint='Задайте SESSION_BACKEND=cached_db.',
+        id='blog.W007',
+    )]
@@ -0,0 +1,113 @@
+"""Сжатие ответов gzip или brotli по заголовку Accept-Encoding.
+
+brotli используется, если установлен пакет ``brotli``; иначе — gzip.
+Потоковые ответы сжимаются порциями с принудительным сбросом буфера
+компрессора, чтобы клиент получал каждую порцию сразу.
+"""
+
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Короткие ответы сжимать невыгодно.
+MIN_LENGTH = 200
+# Качество brotli для динамических ответов: 11 слишком медленно.
+BROTLI_QUALITY = 5
+TEXT_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+
+def accepted_encodings(header):
+    """Множество кодировок из Accept-Encoding (без учёта q)."""
+    return {part.split(';')[0].strip() for part in header.split(',')}
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_gzip_sequence(sequence):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for item in sequence:
+        data = compressor.compress(item) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def is_compressible(response):
+    if response.status_code in (206, 304) or response.has_header(
+        'Content-Encoding'
+    ):
+        return False
+    if not response.get('Content-Type', '').startswith(TEXT_TYPES):
+        return False
+    return response.streaming or len(response.content) >= MIN_LENGTH
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает текстовые ответы; замена GZipMiddleware.
+
+    Включается настройкой COMPRESS_RESPONSES.
+    """
+
+    def __init__(self, get_response):
+        if not settings.COMPRESS_RESPONSES:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        if response.streaming:
+            compress = (
+                compress_brotli_sequence if encoding == 'br'
+                else compress_gzip_sequence
+            )
+            response.streaming_content = compress(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed = (
+                brotli.compress(response.content, quality=BROTLI_QUALITY)
+                if encoding == 'br' else compress_string(response.content)
+            )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
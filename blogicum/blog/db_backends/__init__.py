@@ -0,0 +1,111 @@
+"""Обёртки над бэкендами БД с постоянными соединениями.
+
+Django 3.2 умеет держать соединение открытым между запросами
+(``CONN_MAX_AGE``), но не проверяет его перед повторным использованием.
+Миксин ``PersistentConnectionMixin`` добавляет такую проверку
+(ключ ``CONN_HEALTH_CHECKS`` в настройках БД) и собирает статистику
+соединений текущего процесса для эндпоинта инструментирования.
+Журнал запросов при DEBUG заменяется ``QueryLog`` с обрезанным SQL,
+а при SQL_MONITOR к соединению подключается ``QueryMonitor``.
+"""
+
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from blog.querylog import QueryLog
+from blog.sqlmonitor import QueryMonitor
+
+
+class ConnectionStats:
+    """Счётчики соединений одного процесса-воркера."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases = {}
+
+    def _get(self, alias):
+        return self._aliases.setdefault(alias, {
+            'connections_opened': 0,
+            'connect_seconds': 0.0,
+            'connections_reused': 0,
+            'health_check_failures': 0,
+        })
+
+    def incr(self, alias, key, value=1):
+        with self._lock:
+            self._get(alias)[key] += value
+
+    def snapshot(self):
+        """Возвращает копию счётчиков с идентификатором воркера."""
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'aliases': {
+                    alias: dict(values)
+                    for alias, values in self._aliases.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._aliases.clear()
+
+
+connection_stats = ConnectionStats()
+
+
+class PersistentConnectionMixin:
+    """Проверка состояния и учёт постоянных соединений."""
+
+    health_check_pending = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries_log = QueryLog(self.queries_limit)
+        if settings.SQL_MONITOR:
+            self.execute_wrappers.append(QueryMonitor(self.alias))
+
+    @property
+    def health_checks_enabled(self):
+        return (
+            self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+            and self.settings_dict['CONN_MAX_AGE'] != 0
+        )
+
+    def get_new_connection(self, conn_params):
+        """Открывает соединение и учитывает время подключения."""
+        started = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        connection_stats.incr(self.alias, 'connections_opened')
+        connection_stats.incr(
+            self.alias, 'connect_seconds', time.perf_counter() - started
+        )
+        return connection
+
+    def close_if_unusable_or_obsolete(self):
+        """Вызывается в начале и в конце каждого запроса.
+
+        Сама проверка откладывается до первого обращения к БД,
+        чтобы запросы без SQL не платили за лишний round-trip.
+        """
+        super().close_if_unusable_or_obsolete()
+        self.health_check_pending = self.connection is not None
+
+    def ensure_connection(self):
+        """Перед повторным использованием проверяет, живо ли соединение."""
+        if self.health_check_pending and self.connection is not None:
+            self.health_check_pending = False
+            if self.health_checks_enabled and not self.in_atomic_block:
+                if self.is_usable():
+                    connection_stats.incr(self.alias, 'connections_reused')
+                else:
+                    connection_stats.incr(
+                        self.alias, 'health_check_failures'
+                    )
+                    self.close()
+            else:
+                connection_stats.incr(self.alias, 'connections_reused')
+        super().ensure_connection()
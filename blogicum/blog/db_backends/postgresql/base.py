@@ -0,0 +1,9 @@
+"""PostgreSQL с проверкой и учётом постоянных соединений."""
+
+from django.db.backends.postgresql import base
+
+from blog.db_backends import PersistentConnectionMixin
+
+
+class DatabaseWrapper(PersistentConnectionMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,18 @@
+"""SQLite с проверкой и учётом постоянных соединений.
+
+Ключ ``PRAGMAS`` в настройках БД задаёт PRAGMA, выполняемые при
+открытии каждого соединения, например ``{'journal_mode': 'wal'}``.
+"""
+
+from django.db.backends.sqlite3 import base
+
+from blog.db_backends import PersistentConnectionMixin
+
+
+class DatabaseWrapper(PersistentConnectionMixin, base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
@@ -0,0 +1,41 @@
+"""Потоковое чтение дампов в формате dumpdata (JSON-массив или NDJSON)."""
+
+import gzip
+import json
+
+
+def open_dump(path, mode='rt'):
+    """Открывает дамп, прозрачно распаковывая ``*.gz``."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_json_objects(stream, read_size=1 << 16):
+    """Поочерёдно разбирает объекты из JSON-массива или NDJSON.
+
+    В памяти держится только текущий кусок файла, поэтому размер
+    дампа не ограничен объёмом памяти.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,[]':
+            position += 1
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield obj
+                continue
+        elif eof:
+            return
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
@@ -0,0 +1,57 @@
+"""Быстрое построение адресов для самых частых маршрутов ленты.
+
+``reverse()`` при каждом вызове перебирает шаблоны маршрута, проверяет
+аргументы регулярным выражением и экранирует результат. На странице
+ленты это сотни вызовов с одними и теми же маршрутами. Здесь адрес
+маршрута один раз превращается в строку формата, а дальше адрес
+собирается подстановкой значений.
+
+В отличие от ``reverse()`` значения не проверяются конвертерами пути:
+функция предназначена для ключей из БД (pk, username, slug), которые
+заведомо подходят маршруту.
+"""
+
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+# Маршрут -> имена аргументов в порядке позиционной передачи.
+HOT_ROUTES = {
+    'blog:index': (),
+    'blog:post_detail': ('post_id',),
+    'blog:profile': ('username',),
+    'blog:category_posts': ('category_slug',),
+}
+# Значения-метки подходят конвертерам int, str и slug.
+PLACEHOLDER = '9075318642{}'
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+
+@lru_cache(maxsize=None)
+def url_format(name, urlconf):
+    """Строка формата адреса маршрута без префикса скрипта."""
+    params = HOT_ROUTES[name]
+    placeholders = {
+        param: PLACEHOLDER.format(number)
+        for number, param in enumerate(params)
+    }
+    url = reverse(name, urlconf=urlconf, kwargs=placeholders)
+    url = url[len(get_script_prefix()):]
+    url = url.replace('{', '{{').replace('}', '}}')
+    for number, param in enumerate(params):
+        url = url.replace(placeholders[param], '{%d}' % number)
+    return url
+
+
+def fast_url(name, *args):
+    """Адрес маршрута ``name``; для остальных маршрутов — ``reverse()``."""
+    if name not in HOT_ROUTES:
+        return reverse(name, args=args)
+    urlconf = get_urlconf() or settings.ROOT_URLCONF
+    return get_script_prefix() + url_format(name, urlconf).format(*(
+        arg if isinstance(arg, int) else quote(str(arg), safe=SAFE_CHARS)
+        for arg in args
+    ))
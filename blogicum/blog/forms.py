@@ -1,8 +1,9 @@
 """Формы приложения blog."""
 
 from django import forms
+from django.conf import settings
 
-from .models import Post, User, Comment
+from .models import Location, Post, User, Comment
 
 
 class PostForm(forms.ModelForm):
@@ -37,3 +38,43 @@ class CommentForm(forms.ModelForm):
 
         model = Comment
         fields = ('text',)
+
+
+class NearbyForm(forms.Form):
+    """Точка и радиус для ленты «Публикации рядом».
+
+    Точка задаётся координатами или опубликованным местоположением.
+    """
+
+    location = forms.ModelChoiceField(
+        Location.objects.filter(is_published=True, grid_cell__isnull=False),
+        required=False,
+        label='Местоположение'
+    )
+    latitude = forms.FloatField(
+        min_value=-90, max_value=90, required=False, label='Широта'
+    )
+    longitude = forms.FloatField(
+        min_value=-180, max_value=180, required=False, label='Долгота'
+    )
+    radius = forms.FloatField(
+        min_value=0.1,
+        max_value=settings.NEARBY_MAX_RADIUS_KM,
+        required=False,
+        label='Радиус, км'
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        location = cleaned_data.get('location')
+        if location:
+            cleaned_data['latitude'] = location.latitude
+            cleaned_data['longitude'] = location.longitude
+        if (cleaned_data.get('latitude') is None
+                or cleaned_data.get('longitude') is None):
+            raise forms.ValidationError(
+                'Укажите местоположение или обе координаты.'
+            )
+        if not cleaned_data.get('radius'):
+            cleaned_data['radius'] = settings.NEARBY_RADIUS_KM
+        return cleaned_data
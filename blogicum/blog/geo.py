@@ -0,0 +1,127 @@
+"""Поиск местоположений рядом с точкой без PostGIS.
+
+Поверхность разбита на сетку ячеек ``GRID_STEP`` × ``GRID_STEP`` градусов;
+номер ячейки хранится в индексируемом столбце ``Location.grid_cell``.
+Поиск идёт в три шага: диапазоны номеров ячеек, покрывающих
+ограничивающий прямоугольник (range scan по индексу), фильтр по самому
+прямоугольнику и точное расстояние по формуле гаверсинусов. Все три
+шага выполняются в БД, поэтому результат годится как подзапрос.
+"""
+
+import functools
+import math
+import operator
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import (
+    ASin,
+    Cos,
+    Least,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
+)
+
+GRID_STEP = 0.1
+GRID_ROWS = round(180 / GRID_STEP)
+GRID_COLUMNS = round(360 / GRID_STEP)
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _row(latitude):
+    return min(int((latitude + 90) / GRID_STEP), GRID_ROWS - 1)
+
+
+def _column(longitude):
+    return int((longitude + 180) / GRID_STEP) % GRID_COLUMNS
+
+
+def grid_cell(latitude, longitude):
+    """Номер ячейки сетки для точки или None, если координат нет."""
+    if latitude is None or longitude is None:
+        return None
+    return _row(latitude) * GRID_COLUMNS + _column(longitude)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Прямоугольник (south, north, west, east), содержащий круг.
+
+    Около полюсов прямоугольник охватывает все долготы; при переходе
+    через 180-й меридиан ``west`` оказывается больше ``east``.
+    """
+    delta = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - delta, -90), min(latitude + delta, 90)
+    cos_lat = math.cos(math.radians(max(abs(south), abs(north))))
+    if cos_lat * 180 <= delta:
+        return south, north, -180, 180
+    delta_lon = delta / cos_lat
+    west = (longitude - delta_lon + 180) % 360 - 180
+    east = (longitude + delta_lon + 180) % 360 - 180
+    return south, north, west, east
+
+
+def cell_ranges(box):
+    """Отрезки номеров ячеек [first, last], покрывающие прямоугольник."""
+    south, north, west, east = box
+    if (west, east) == (-180, 180):
+        return [(_row(south) * GRID_COLUMNS,
+                 _row(north) * GRID_COLUMNS + GRID_COLUMNS - 1)]
+    first, last = _column(west), _column(east)
+    spans = (
+        [(first, last)] if first <= last
+        else [(first, GRID_COLUMNS - 1), (0, last)]
+    )
+    return [
+        (row * GRID_COLUMNS + left, row * GRID_COLUMNS + right)
+        for row in range(_row(south), _row(north) + 1)
+        for left, right in spans
+    ]
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Расстояние по дуге большого круга."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2)
+        * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1, math.sqrt(a)))
+
+
+def distance_expression(latitude, longitude):
+    """``distance_km`` от точки до полей latitude/longitude в SQL."""
+    phi = math.radians(latitude)
+    half_sin = Power(Sin((Radians(F('latitude')) - Value(phi)) / 2), 2)
+    half_sin_lon = Power(
+        Sin((Radians(F('longitude')) - Value(math.radians(longitude))) / 2),
+        2,
+    )
+    a = half_sin + Value(math.cos(phi)) * Cos(Radians(F('latitude'))) * (
+        half_sin_lon
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Value(1.0), Sqrt(a)))
+
+
+def nearby(queryset, latitude, longitude, radius_km):
+    """Места ``queryset`` в радиусе с полем ``distance`` (км).
+
+    Кандидаты отбираются по индексу ``grid_cell`` и прямоугольнику,
+    точное расстояние считается только для них. Результат можно
+    передать подзапросом: ``location__in=nearby(...)``.
+    """
+    box = bounding_box(latitude, longitude, radius_km)
+    south, north, west, east = box
+    cells = functools.reduce(operator.or_, (
+        Q(grid_cell__range=cells) for cells in cell_ranges(box)
+    ))
+    longitudes = Q(longitude__range=(west, east))
+    if west > east:
+        longitudes = Q(longitude__gte=west) | Q(longitude__lte=east)
+    return queryset.filter(
+        cells, longitudes, latitude__range=(south, north)
+    ).annotate(
+        distance=distance_expression(latitude, longitude)
+    ).filter(distance__lte=radius_km).order_by('distance')
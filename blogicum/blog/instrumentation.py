@@ -0,0 +1,26 @@
+"""Эндпоинт инструментирования.
+
+Подсистемы регистрируют функции-поставщики метрик через ``register``,
+а представление ``instrumentation_view`` отдаёт их сотрудникам в JSON.
+"""
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+_providers = {}
+
+
+def register(name, provider):
+    """Регистрирует поставщика метрик под именем ``name``."""
+    _providers[name] = provider
+
+
+def collect():
+    """Собирает метрики всех зарегистрированных поставщиков."""
+    return {name: provider() for name, provider in _providers.items()}
+
+
+@staff_member_required
+def instrumentation_view(request):
+    """Метрики текущего процесса-воркера."""
+    return JsonResponse(collect(), json_dumps_params={'ensure_ascii': False})
@@ -0,0 +1,301 @@
+"""Нагрузочные сценарии без сторонних зависимостей.
+
+Сценарий — последовательность HTTP-запросов одного виртуального
+пользователя. Запросы выполняются либо тестовым клиентом Django внутри
+процесса, либо по HTTP к запущенному серверу (``http://host:port``).
+"""
+
+import http.cookiejar
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.utils import timezone
+
+from .benchmark import summarize
+from .models import Category
+from .utils import get_optimized_posts
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+LOGIN_PASSWORD = 'seed-password'
+
+
+class ClientSession:
+    """Виртуальный пользователь на тестовом клиенте Django."""
+
+    def __init__(self, host):
+        self.client = Client(HTTP_HOST=host)
+
+    def login(self, user):
+        self.client.force_login(user)
+
+    def get(self, path):
+        return self.client.get(path).status_code
+
+    def post(self, path, data):
+        return self.client.post(path, data).status_code
+
+
+class HttpSession:
+    """Виртуальный пользователь, работающий с сервером по HTTP."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            NoRedirectHandler,
+        )
+        self.csrf_token = ''
+
+    def request(self, path, data=None):
+        if data is not None:
+            data = urllib.parse.urlencode(
+                {**data, 'csrfmiddlewaretoken': self.csrf_token}
+            ).encode()
+        request = urllib.request.Request(
+            self.base_url + path, data=data,
+            headers={'Referer': self.base_url + path},
+        )
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                body = response.read().decode('utf-8', 'replace')
+                status = response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+        match = CSRF_INPUT.search(body)
+        if match:
+            self.csrf_token = match.group(1)
+        return status
+
+    def login(self, user):
+        self.get('/auth/login/')
+        self.post(
+            '/auth/login/',
+            {'username': user.username, 'password': LOGIN_PASSWORD},
+        )
+
+    def get(self, path):
+        return self.request(path)
+
+    def post(self, path, data):
+        return self.request(path, data)
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Не следует за редиректами: ответ 302 сам является результатом."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Scenario:
+    """Базовый сценарий: ``prepare`` один раз, ``step`` в цикле."""
+
+    name = None
+    requires_login = False
+
+    def prepare(self):
+        """Читает из БД данные, нужные сценарию (ключи, адреса)."""
+        self.post_ids = list(
+            get_optimized_posts().values_list('pk', flat=True)[:1000]
+        )
+        self.category_slugs = list(
+            Category.objects.filter(is_published=True)
+            .values_list('slug', flat=True)[:100]
+        )
+        self.usernames = list(
+            get_user_model().objects.values_list('username', flat=True)[:100]
+        )
+
+    def step(self, session, rng):
+        """Возвращает список троек (метка, код ответа, длительность)."""
+        raise NotImplementedError
+
+    def get(self, session, label, path):
+        started = time.perf_counter()
+        status = session.get(path)
+        return label, status, time.perf_counter() - started
+
+    def post(self, session, label, path, data):
+        started = time.perf_counter()
+        status = session.post(path, data)
+        return label, status, time.perf_counter() - started
+
+
+class AnonymousBrowsing(Scenario):
+    name = 'anonymous_browsing'
+
+    def step(self, session, rng):
+        results = [self.get(session, 'index', '/')]
+        if self.category_slugs:
+            slug = rng.choice(self.category_slugs)
+            results.append(
+                self.get(session, 'category', f'/category/{slug}/')
+            )
+        if self.post_ids:
+            post_id = rng.choice(self.post_ids)
+            results.append(
+                self.get(session, 'post_detail', f'/posts/{post_id}/')
+            )
+        if self.usernames:
+            username = rng.choice(self.usernames)
+            results.append(
+                self.get(session, 'profile', f'/profile/{username}/')
+            )
+        return results
+
+
+class Commenting(Scenario):
+    name = 'commenting'
+    requires_login = True
+
+    def step(self, session, rng):
+        post_id = rng.choice(self.post_ids)
+        return [
+            self.get(session, 'post_detail', f'/posts/{post_id}/'),
+            self.post(
+                session, 'add_comment', f'/posts/{post_id}/comment/',
+                {'text': f'Нагрузочный комментарий {rng.random()}'},
+            ),
+        ]
+
+
+class PostCreation(Scenario):
+    name = 'post_creation'
+    requires_login = True
+
+    def prepare(self):
+        super().prepare()
+        self.category_ids = list(
+            Category.objects.filter(is_published=True)
+            .values_list('pk', flat=True)[:100]
+        )
+
+    def step(self, session, rng):
+        pub_date = timezone.localtime().strftime('%Y-%m-%dT%H:%M')
+        return [
+            self.get(session, 'create_post_form', '/posts/create/'),
+            self.post(session, 'create_post', '/posts/create/', {
+                'title': f'Нагрузочный пост {rng.random()}',
+                'text': 'Текст нагрузочного поста.',
+                'pub_date': pub_date,
+                'category': rng.choice(self.category_ids),
+                'is_published': 'on',
+            }),
+        ]
+
+
+class DeepPagination(Scenario):
+    name = 'deep_pagination'
+
+    def prepare(self):
+        super().prepare()
+        pages = -(-get_optimized_posts().count() // settings.LIMIT_POSTS)
+        self.deep_pages = list(range(max(1, pages * 9 // 10), pages + 1))
+
+    def step(self, session, rng):
+        page = rng.choice(self.deep_pages)
+        return [self.get(session, 'index_deep_page', f'/?page={page}')]
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (AnonymousBrowsing, Commenting, PostCreation,
+                     DeepPagination)
+}
+
+
+class ScenarioRunner:
+    """Прогон сценария несколькими виртуальными пользователями-потоками.
+
+    ``requests`` — число итераций сценария на всех пользователей.
+    """
+
+    def __init__(self, scenario, target, *, requests, concurrency, seed,
+                 host='localhost'):
+        self.scenario = scenario
+        self.target = target
+        self.concurrency = concurrency
+        self.seed = seed
+        self.host = host
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+        self.iterations = iter(range(requests))
+
+    def make_session(self, number):
+        if self.target == 'client':
+            session = ClientSession(self.host)
+        else:
+            session = HttpSession(self.target)
+        if self.users:
+            session.login(self.users[number % len(self.users)])
+        return session
+
+    def take_iteration(self):
+        with self.lock:
+            return next(self.iterations, None) is not None
+
+    def record(self, results):
+        with self.lock:
+            for label, status, duration in results:
+                self.samples[label].append(duration)
+                if status >= 400:
+                    self.errors[label] += 1
+
+    def worker(self, number):
+        rng = random.Random(f'{self.seed}-{number}')
+        session = self.make_session(number)
+        while self.take_iteration():
+            started = time.perf_counter()
+            try:
+                results = self.scenario.step(session, rng)
+            except Exception:
+                results = [('exception', 599, time.perf_counter() - started)]
+            self.record(results)
+
+    def run(self):
+        """Выполняет сценарий и возвращает сводку в виде словаря."""
+        self.scenario.prepare()
+        self.users = list(
+            get_user_model().objects.filter(is_active=True)
+            .order_by('pk')[:self.concurrency]
+        ) if self.scenario.requires_login else []
+        threads = [
+            threading.Thread(target=self.worker, args=(number,))
+            for number in range(self.concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summary(time.perf_counter() - started)
+
+    def summary(self, elapsed):
+        all_samples = [
+            value for values in self.samples.values() for value in values
+        ]
+        total = len(all_samples)
+        return {
+            'scenario': self.scenario.name,
+            'concurrency': self.concurrency,
+            'requests': total,
+            'rps': round(total / elapsed, 1) if elapsed else 0,
+            'error_rate': (
+                round(sum(self.errors.values()) / total, 4) if total else 0
+            ),
+            'latency': summarize(all_samples),
+            'endpoints': {
+                label: {**summarize(values), 'errors': self.errors[label]}
+                for label, values in sorted(self.samples.items())
+            },
+        }
@@ -0,0 +1,128 @@
+"""Сравнение конкурентности ASGI и WSGI на страницах ленты."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test.client import RequestFactory
+
+from blog.benchmark import summarize
+
+HOST = 'localhost'
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет GET-запросы к страницам ленты через ASGI-приложение '
+        '(конкурентные корутины, как под uvicorn) и через WSGI-приложение '
+        '(пул потоков) с одинаковой конкурентностью. Вид представлений '
+        'задаётся переменной окружения ASYNC_FEED_VIEWS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Адрес страницы; можно указать несколько раз.'
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 10, 50]
+        )
+
+    def run_wsgi(self, paths, requests, concurrency):
+        application = get_wsgi_application()
+        factory = RequestFactory()
+
+        def call(path):
+            environ = factory._base_environ(PATH_INFO=path, HTTP_HOST=HOST)
+            statuses = []
+            started = time.perf_counter()
+            body = application(
+                environ, lambda status, headers: statuses.append(status)
+            )
+            b''.join(body)
+            body.close()
+            return time.perf_counter() - started, statuses[0]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(
+                call, (paths[i % len(paths)] for i in range(requests))
+            ))
+        elapsed = time.perf_counter() - started
+        return self.report(results, elapsed)
+
+    def run_asgi(self, paths, requests, concurrency):
+        application = get_asgi_application()
+
+        async def call(path, semaphore):
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [(b'host', HOST.encode())],
+                'client': ('127.0.0.1', 50000),
+                'server': (HOST, 80),
+            }
+            messages = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                messages.append(message)
+
+            async with semaphore:
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - started, messages[0]['status']
+
+        async def main():
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(
+                call(paths[i % len(paths)], semaphore)
+                for i in range(requests)
+            ))
+
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        elapsed = time.perf_counter() - started
+        return self.report(results, elapsed)
+
+    def report(self, results, elapsed):
+        errors = sum(1 for _, status in results if int(str(status)[:3]) >= 500)
+        return {
+            'rps': round(len(results) / elapsed, 1),
+            'errors': errors,
+            'latency': summarize([duration for duration, _ in results]),
+        }
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/']
+        report = {
+            'async_feed_views': settings.ASYNC_FEED_VIEWS,
+            'paths': paths,
+            'results': [],
+        }
+        for concurrency in options['concurrency']:
+            report['results'].append({
+                'concurrency': concurrency,
+                'wsgi': self.run_wsgi(
+                    paths, options['requests'], concurrency
+                ),
+                'asgi': self.run_asgi(
+                    paths, options['requests'], concurrency
+                ),
+            })
+        self.stdout.write(json.dumps(report, indent=2))
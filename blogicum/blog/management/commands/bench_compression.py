@@ -0,0 +1,74 @@
+"""Размер ответов основных страниц до и после минификации и сжатия."""
+
+import copy
+import gzip
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from blog.compression import BROTLI_QUALITY, brotli
+from blog.models import Category, User
+from blog.utils import get_optimized_posts
+
+
+def plain_templates():
+    """Настройка TEMPLATES без MinifyingLoader."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Запрашивает основные страницы и сравнивает размер HTML без '
+        'минификации, с минификацией шаблонов и после gzip/brotli.'
+    )
+
+    def routes(self):
+        post = get_optimized_posts().first()
+        category = Category.objects.filter(is_published=True).first()
+        user = User.objects.filter(posts__isnull=False).first()
+        routes = {'index': '/', 'categories': '/categories/',
+                  'locations': '/locations/'}
+        if post:
+            routes['post_detail'] = f'/posts/{post.pk}/'
+        if category:
+            routes['category'] = f'/category/{category.slug}/'
+        if user:
+            routes['profile'] = f'/profile/{user.username}/'
+        return routes
+
+    def fetch(self, url, templates=None):
+        overrides = {'DEBUG': False, 'COMPRESS_RESPONSES': False}
+        if templates:
+            overrides['TEMPLATES'] = templates
+        with override_settings(**overrides):
+            response = Client(HTTP_HOST='localhost').get(url)
+        if response.streaming:
+            return b''.join(response.streaming_content)
+        return response.content
+
+    def handle(self, *args, **options):
+        report = {}
+        for name, url in self.routes().items():
+            raw = self.fetch(url, plain_templates())
+            minified = self.fetch(url)
+            sizes = {
+                'raw': len(raw),
+                'minified': len(minified),
+                'minified_gzip': len(gzip.compress(minified, 6, mtime=0)),
+            }
+            if brotli is not None:
+                sizes['minified_br'] = len(
+                    brotli.compress(minified, quality=BROTLI_QUALITY)
+                )
+            best = min(sizes.values())
+            sizes['saved_percent'] = round(100 - best * 100 / sizes['raw'], 1)
+            report[name] = {'url': url, **sizes}
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,76 @@
+"""Замер выигрыша от постоянных соединений с БД."""
+
+import json
+
+from django.conf import settings
+from django.core import signals
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.benchmark import summarize, timed
+from blog.db_backends import connection_stats
+from blog.utils import get_optimized_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет цикл «начало запроса — запрос ленты — конец запроса» '
+        'с CONN_MAX_AGE=0 и с постоянным соединением и сравнивает время '
+        'подключения в расчёте на запрос.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--max-age', type=int, default=600,
+            help='CONN_MAX_AGE для постоянного режима.'
+        )
+
+    def run_mode(self, connection, max_age, requests):
+        """Один прогон с заданным CONN_MAX_AGE."""
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection_stats.reset()
+        samples = []
+        for _ in range(requests):
+            with timed(samples):
+                signals.request_started.send(sender=self.__class__)
+                list(
+                    get_optimized_posts(
+                        annotate_comments=True
+                    ).using(connection.alias)[:settings.LIMIT_POSTS]
+                )
+                signals.request_finished.send(sender=self.__class__)
+        stats = connection_stats.snapshot()['aliases'].get(
+            connection.alias, {}
+        )
+        connection.close()
+        return {
+            'conn_max_age': max_age,
+            'latency': summarize(samples),
+            'connections_opened': stats.get('connections_opened', 0),
+            'connect_ms_per_request': round(
+                stats.get('connect_seconds', 0.0) * 1000 / requests, 4
+            ),
+        }
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        original_max_age = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            per_request = self.run_mode(connection, 0, options['requests'])
+            persistent = self.run_mode(
+                connection, options['max_age'], options['requests']
+            )
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original_max_age
+        report = {
+            'per_request_connection': per_request,
+            'persistent_connection': persistent,
+            'saved_connect_ms_per_request': round(
+                per_request['connect_ms_per_request']
+                - persistent['connect_ms_per_request'], 4
+            ),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
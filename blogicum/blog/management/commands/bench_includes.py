@@ -0,0 +1,96 @@
+"""Микробенчмарк рендеринга ленты с подстановкой include и без неё."""
+
+import copy
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from blog.benchmark import summarize, timed
+from blog.models import Category, Post, User
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+INLINING_LOADER = 'blog.template_loaders.InliningLoader'
+
+
+def templates_setting(inline):
+    """TEMPLATES с cached.Loader, с InliningLoader или без него."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = templates[0]['OPTIONS']['loaders']
+    if loaders[0][0] == CACHED_LOADER:
+        loaders = loaders[0][1]
+    if loaders[0][0] == INLINING_LOADER:
+        loaders = loaders[0][1]
+    if inline:
+        loaders = [(INLINING_LOADER, loaders)]
+    templates[0]['OPTIONS']['loaders'] = [(CACHED_LOADER, loaders)]
+    return templates
+
+
+def fake_posts(count):
+    """Несохранённые посты: замеряется только шаблон, без запросов к БД."""
+    category = Category(title='Категория', slug='category', is_published=True)
+    author = User(username='author')
+    posts = []
+    for number in range(count):
+        post = Post(
+            id=number + 1, title=f'Пост {number}', text='Текст поста. ' * 20,
+            pub_date=timezone.now(), author=author, category=category,
+            is_published=True,
+        )
+        post.comments_count = number
+        posts.append(post)
+    return posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Рендерит blog/post_list.html с 10 и 100 карточками постов '
+        'с InliningLoader и без него (оба варианта — с cached.Loader).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument(
+            '--cards', type=int, nargs='+', default=[10, 100]
+        )
+
+    def render(self, cards):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        page = Paginator(fake_posts(cards), cards).page(1)
+        return render_to_string(
+            'blog/post_list.html',
+            {'page_obj': page, 'paginator': page.paginator},
+            request,
+        )
+
+    def measure(self, cards, repeat, inline):
+        with override_settings(TEMPLATES=templates_setting(inline)):
+            html = self.render(cards)
+            samples = []
+            for _ in range(repeat):
+                with timed(samples):
+                    self.render(cards)
+        return html, summarize(samples)
+
+    def handle(self, *args, **options):
+        report = {}
+        for cards in options['cards']:
+            plain_html, plain = self.measure(cards, options['repeat'], False)
+            inlined_html, inlined = self.measure(
+                cards, options['repeat'], True
+            )
+            report[f'{cards}_cards'] = {
+                'include': plain,
+                'inlined': inlined,
+                'speedup': round(plain['mean_ms'] / inlined['mean_ms'], 2),
+                'same_html': plain_html == inlined_html,
+            }
+        self.stdout.write(json.dumps(report, indent=2))
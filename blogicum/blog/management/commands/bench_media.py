@@ -0,0 +1,81 @@
+"""Замер отдачи больших файлов из MEDIA_ROOT."""
+
+import json
+import os
+import tempfile
+from types import ModuleType
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import path
+from django.views.static import serve
+
+from blog.benchmark import summarize, timed
+from blog.media import serve_media
+
+FILE_NAME = 'large.jpg'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает blog.media.serve_media с django.views.static.serve '
+        '(прежний static() в urls.py) на большом файле: полная загрузка, '
+        'запрос первого мегабайта и повторный запрос с If-None-Match.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size-mb', type=int, default=20,
+            help='Размер тестового файла, МБ.'
+        )
+        parser.add_argument('--requests', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, FILE_NAME), 'wb') as file:
+                file.write(os.urandom(options['size_mb'] * 1024 * 1024))
+            urlconf = ModuleType('bench_media_urls')
+            urlconf.urlpatterns = [
+                path('static/<path:path>', serve, {'document_root': root}),
+                path('media/<path:path>', serve_media),
+            ]
+            with override_settings(
+                MEDIA_ROOT=root, ROOT_URLCONF=urlconf, DEBUG=False
+            ):
+                report = self.run(options['requests'])
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run(self, requests):
+        client = Client(HTTP_HOST='localhost')
+        etag = client.get(f'/media/{FILE_NAME}')['ETag']
+        return {
+            view: {
+                'full': self.measure(client, url, requests),
+                'range_1mb': self.measure(
+                    client, url, requests, HTTP_RANGE='bytes=0-1048575'
+                ),
+                'if_none_match': self.measure(
+                    client, url, requests, HTTP_IF_NONE_MATCH=etag
+                ),
+            }
+            for view, url in (
+                ('django_static_serve', f'/static/{FILE_NAME}'),
+                ('serve_media', f'/media/{FILE_NAME}'),
+            )
+        }
+
+    def measure(self, client, url, requests, **headers):
+        samples = []
+        for _ in range(requests):
+            with timed(samples):
+                response = client.get(url, **headers)
+                size = sum(map(len, response.streaming_content)) if (
+                    response.streaming
+                ) else len(response.content)
+                response.close()
+        return {
+            'status': response.status_code,
+            'bytes': size,
+            'latency': summarize(samples),
+        }
@@ -0,0 +1,213 @@
+"""Бенчмарк вариантов get_optimized_posts на наборах данных разного размера."""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.benchmark import summarize, timed
+from blog.models import Post
+from blog.utils import get_optimized_posts
+
+from .loadtest import current_commit
+
+# Сочетания аргументов get_optimized_posts, которые используют ленты.
+CASES = {
+    'published': {'filter_published': True, 'annotate_comments': False},
+    'published_comments': {
+        'filter_published': True, 'annotate_comments': True,
+    },
+    'all': {'filter_published': False, 'annotate_comments': False},
+    'all_comments': {'filter_published': False, 'annotate_comments': True},
+}
+SIZES = [10_000, 100_000, 1_000_000]
+# Разница p50 меньше этой не считается регрессией: шум замера.
+NOISE_MS = 1.0
+
+
+def explain(connection, function):
+    """План последнего запроса, выполненного ``function``."""
+    queries = []
+
+    def capture(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        function()
+    sql, params = queries[-1]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{connection.ops.explain_query_prefix()} {sql}', params
+        )
+        # В SQLite описание шага — последний столбец строки плана.
+        return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет первую страницу ленты и Paginator.count для каждого '
+        'сочетания filter_published и annotate_comments в '
+        'get_optimized_posts на SQLite-базах из --sizes постов, созданных '
+        'командой seed, или на текущей базе (--current). Сохраняет время '
+        'и планы EXPLAIN в JSON; с --compare завершается ошибкой, если '
+        'p50 вырос больше чем на --tolerance.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+        parser.add_argument(
+            '--current', action='store_true',
+            help='Замерить текущую базу, не создавая наборы данных.'
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=os.path.join(tempfile.gettempdir(), 'blogicum-bench'),
+            help='Каталог для баз с наборами данных; базы переиспользуются.'
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument(
+            '--compare', help='Базовый отчёт для поиска регрессий.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Допустимый рост p50 относительно базового отчёта.'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        if not options['current'] and connection.vendor != 'sqlite':
+            raise CommandError(
+                'Наборы данных создаются только для SQLite; '
+                'для другой БД используйте --current.'
+            )
+        report = {
+            'commit': current_commit(),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'repeat': options['repeat'],
+            'datasets': {},
+        }
+        # Каждый замер дольше SLOW_QUERY_MS попал бы в журнал blog.sql.
+        slow_log = logging.getLogger('blog.sql')
+        original_name = connection.settings_dict['NAME']
+        sizes = [None] if options['current'] else options['sizes']
+        slow_log.disabled = True
+        try:
+            for size in sizes:
+                if size is not None:
+                    self.use_dataset(connection, size, options)
+                report['datasets'][str(size or 'current')] = self.run_cases(
+                    connection, options['repeat']
+                )
+        finally:
+            slow_log.disabled = False
+            if connection.settings_dict['NAME'] != original_name:
+                connection.close()
+                connection.settings_dict['NAME'] = original_name
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(text)
+        self.stdout.write(text)
+        if options['compare']:
+            self.compare(report, options['compare'], options['tolerance'])
+
+    def use_dataset(self, connection, size, options):
+        """Переключает соединение на базу из ``size`` постов.
+
+        База создаётся один раз: migrate и seed во временный файл,
+        который переименовывается после заполнения.
+        """
+        os.makedirs(options['data_dir'], exist_ok=True)
+        path = os.path.join(
+            options['data_dir'], f"posts-{options['seed']}-{size}.sqlite3"
+        )
+        connection.close()
+        if not os.path.exists(path):
+            partial = f'{path}.partial'
+            if os.path.exists(partial):
+                os.remove(partial)
+            connection.settings_dict['NAME'] = partial
+            self.stderr.write(f'Создание набора данных {size} постов...')
+            call_command('migrate', verbosity=0)
+            call_command(
+                'seed', seed=options['seed'], posts=size, comments=size * 2,
+                users=max(10, size // 100), categories=20, locations=100,
+                image_ratio=0, workers=options['workers'],
+                batch_size=5000, stdout=self.stderr,
+            )
+            connection.close()
+            os.replace(partial, path)
+        connection.settings_dict['NAME'] = path
+
+    def run_cases(self, connection, repeat):
+        results = {'posts': Post.objects.count(), 'cases': {}}
+        for name, arguments in CASES.items():
+            queryset = get_optimized_posts(**arguments)
+
+            def page():
+                return list(queryset.all()[:settings.LIMIT_POSTS])
+
+            def count():
+                return Paginator(queryset.all(), settings.LIMIT_POSTS).count
+
+            results['cases'][name] = {
+                'page': self.measure(page, repeat),
+                'count': self.measure(count, repeat),
+                'plans': {
+                    'page': explain(connection, page),
+                    'count': explain(connection, count),
+                },
+            }
+        return results
+
+    def measure(self, function, repeat):
+        function()
+        samples = []
+        for _ in range(repeat):
+            with timed(samples):
+                function()
+        return summarize(samples)
+
+    def compare(self, report, path, tolerance):
+        """Сравнивает p50 и планы с базовым отчётом."""
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        self.stdout.write(f"Сравнение с {baseline.get('commit') or path}:")
+        regressions = []
+        for dataset, current in report['datasets'].items():
+            previous = baseline.get('datasets', {}).get(dataset)
+            if not previous:
+                continue
+            for name, case in current['cases'].items():
+                old = previous['cases'].get(name)
+                if not old:
+                    continue
+                for kind in ('page', 'count'):
+                    before = old[kind]['p50_ms']
+                    after = case[kind]['p50_ms']
+                    label = f'{dataset}/{name}/{kind}'
+                    slower = (
+                        after > before * (1 + tolerance)
+                        and after - before > NOISE_MS
+                    )
+                    if slower:
+                        regressions.append(label)
+                    plan_changed = old['plans'][kind] != case['plans'][kind]
+                    self.stdout.write(
+                        f"  {label}: p50 {before} -> {after} мс"
+                        f"{' РЕГРЕССИЯ' if slower else ''}"
+                        f"{', план изменился' if plan_changed else ''}"
+                    )
+        if regressions:
+            raise CommandError(f"Регрессии: {', '.join(regressions)}")
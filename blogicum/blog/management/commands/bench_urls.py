@@ -0,0 +1,93 @@
+"""Микробенчмарк адресов ленты: reverse() против fast_url."""
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.urls import reverse
+
+from blog.benchmark import summarize, timed
+from blog.fast_urls import fast_url
+
+from .bench_includes import fake_posts
+
+# Адреса, которые строит одна карточка поста в ленте.
+REVERSE_TEMPLATE = Template(
+    "{% for post in posts %}"
+    "{% url 'blog:profile' post.author.username %}"
+    "{% url 'blog:category_posts' post.category.slug %}"
+    "{% url 'blog:post_detail' post.id %}"
+    "{% url 'blog:post_detail' post.id %}"
+    "{% endfor %}"
+)
+FAST_TEMPLATE = Template(
+    "{% for post in posts %}"
+    "{{ post.author_url }}{{ post.category.url }}{{ post.url }}{{ post.url }}"
+    "{% endfor %}"
+)
+
+
+def reverse_urls(posts):
+    return [
+        (
+            reverse('blog:profile', args=[post.author.username]),
+            reverse('blog:category_posts', args=[post.category.slug]),
+            reverse('blog:post_detail', args=[post.id]),
+        )
+        for post in posts
+    ]
+
+
+def fast_urls(posts):
+    return [
+        (
+            fast_url('blog:profile', post.author.username),
+            fast_url('blog:category_posts', post.category.slug),
+            fast_url('blog:post_detail', post.id),
+        )
+        for post in posts
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает reverse() и {% url %} с fast_url и свойствами моделей '
+        'при построении адресов страницы ленты из --cards постов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--cards', type=int, default=100)
+
+    def measure(self, function, argument, repeat):
+        result = function(argument)
+        samples = []
+        for _ in range(repeat):
+            with timed(samples):
+                function(argument)
+        return result, summarize(samples)
+
+    def handle(self, *args, **options):
+        posts = fake_posts(options['cards'])
+        context = Context({'posts': posts})
+        report = {}
+        for label, slow, fast, argument in (
+            ('python', reverse_urls, fast_urls, posts),
+            ('template', REVERSE_TEMPLATE.render, FAST_TEMPLATE.render,
+             context),
+        ):
+            slow_result, slow_stats = self.measure(
+                slow, argument, options['repeat']
+            )
+            fast_result, fast_stats = self.measure(
+                fast, argument, options['repeat']
+            )
+            report[label] = {
+                'reverse': slow_stats,
+                'fast_url': fast_stats,
+                'speedup': round(
+                    slow_stats['mean_ms'] / fast_stats['mean_ms'], 2
+                ),
+                'same_urls': slow_result == fast_result,
+            }
+        self.stdout.write(json.dumps(report, indent=2))
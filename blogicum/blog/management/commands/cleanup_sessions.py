@@ -0,0 +1,58 @@
+"""Пакетное удаление устаревших сессий."""
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+DB_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет устаревшие сессии из django_session небольшими пачками, '
+        'не блокируя таблицу одним большим DELETE, как clearsessions. '
+        'С --interval работает в фоне и повторяет очистку.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Пауза между пачками, секунды.'
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять очистку каждые N секунд.'
+        )
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE not in DB_ENGINES:
+            self.stdout.write(
+                f'{settings.SESSION_ENGINE} не хранит сессии в БД, '
+                'очищать нечего.'
+            )
+            return
+        while True:
+            deleted = self.cleanup(options['batch_size'], options['pause'])
+            self.stdout.write(f'Удалено устаревших сессий: {deleted}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def cleanup(self, batch_size, pause):
+        deleted = 0
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=timezone.now())
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += Session.objects.filter(pk__in=keys).delete()[0]
+            time.sleep(pause)
@@ -0,0 +1,147 @@
+"""Потоковая выгрузка контента в NDJSON или CSV."""
+
+import csv
+import gzip
+import json
+from datetime import datetime, time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.models import Category, Comment, Location, Post
+
+# Порядок выгрузки совпадает с порядком зависимостей, поэтому
+# NDJSON-файлы можно загружать обратно командой importdump по очереди.
+EXPORTS = {
+    'categories': (Category, 'created_at'),
+    'locations': (Location, 'created_at'),
+    'users': (get_user_model(), 'date_joined'),
+    'posts': (Post, 'pub_date'),
+    'comments': (Comment, 'created_at'),
+}
+EXCLUDED_FIELDS = {'password'}
+
+
+def parse_moment(value):
+    """Разбирает дату или дату со временем из аргумента командной строки."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает категории, местоположения, пользователей, посты '
+        'и комментарии в NDJSON (формат dumpdata) или CSV, читая таблицы '
+        'итератором порциями, без загрузки целиком в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tables', nargs='*',
+            help=f"Что выгружать ({', '.join(EXPORTS)}); по умолчанию всё."
+        )
+        parser.add_argument(
+            '--format', choices=('ndjson', 'csv'), default='ndjson'
+        )
+        parser.add_argument('--output-dir', default='.')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--since', type=parse_moment,
+            help='Начало периода (дата или дата со временем).'
+        )
+        parser.add_argument(
+            '--until', type=parse_moment,
+            help='Конец периода, не включительно.'
+        )
+
+    def handle(self, *args, **options):
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        tables = options['tables'] or list(EXPORTS)
+        unknown = set(tables) - set(EXPORTS)
+        if unknown:
+            raise CommandError(
+                f"Неизвестные таблицы: {', '.join(sorted(unknown))}"
+            )
+        for table in EXPORTS:
+            if table not in tables:
+                continue
+            model, date_field = EXPORTS[table]
+            queryset = model._base_manager.order_by('pk')
+            if options['since']:
+                queryset = queryset.filter(
+                    **{f'{date_field}__gte': options['since']}
+                )
+            if options['until']:
+                queryset = queryset.filter(
+                    **{f'{date_field}__lt': options['until']}
+                )
+            path = output_dir / f"{table}.{options['format']}"
+            if options['gzip']:
+                path = path.with_name(path.name + '.gz')
+            with self.open(path, options['gzip']) as stream:
+                count = getattr(self, f"write_{options['format']}")(
+                    stream, model, queryset, options['chunk_size']
+                )
+            self.stdout.write(f'{path}: {count}')
+
+    def open(self, path, compress):
+        if compress:
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    def get_fields(self, model):
+        return [
+            field for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in EXCLUDED_FIELDS
+        ]
+
+    def rows(self, model, queryset, chunk_size):
+        """Строки таблицы в виде кортежей (pk, значения полей)."""
+        fields = self.get_fields(model)
+        columns = ['pk', *(field.attname for field in fields)]
+        for row in queryset.values_list(*columns).iterator(
+            chunk_size=chunk_size
+        ):
+            yield row[0], row[1:]
+
+    def write_ndjson(self, stream, model, queryset, chunk_size):
+        names = [field.name for field in self.get_fields(model)]
+        label = model._meta.label_lower
+        count = 0
+        for pk, values in self.rows(model, queryset, chunk_size):
+            stream.write(json.dumps(
+                {
+                    'model': label,
+                    'pk': pk,
+                    'fields': dict(zip(names, values)),
+                },
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+            ))
+            stream.write('\n')
+            count += 1
+        return count
+
+    def write_csv(self, stream, model, queryset, chunk_size):
+        writer = csv.writer(stream)
+        writer.writerow(
+            ['id', *(field.name for field in self.get_fields(model))]
+        )
+        count = 0
+        for pk, values in self.rows(model, queryset, chunk_size):
+            writer.writerow([pk, *values])
+            count += 1
+        return count
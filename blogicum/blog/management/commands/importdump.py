@@ -0,0 +1,203 @@
+"""Быстрая потоковая загрузка дампов (аналог loaddata)."""
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    IntegrityError,
+    connections,
+    models,
+    transaction,
+)
+
+from blog.dumps import iter_json_objects, open_dump
+
+INDEX_QUERIES = {
+    'sqlite': (
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL"
+    ),
+    'postgresql': (
+        'SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s'
+    ),
+}
+
+
+@contextmanager
+def preserved_timestamps(model):
+    """Отключает auto_now/auto_now_add, чтобы сохранить даты из дампа."""
+    fields = [
+        field for field in model._meta.local_fields
+        if isinstance(field, models.DateField)
+        and (field.auto_now or field.auto_now_add)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает дамп dumpdata (JSON-массив или NDJSON, можно .gz), '
+        'разбирая его по одному объекту и вставляя пачками через '
+        'bulk_create. Неуникальные индексы загружаемых таблиц '
+        'удаляются на время загрузки и создаются заново в конце. '
+        'Сигналы post_save не отправляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump', help='Путь к файлу дампа.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--progress-every', type=int, default=10000,
+            help='Как часто (в объектах) печатать прогресс.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки с уже существующими ключами.'
+        )
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не удалять индексы на время загрузки.'
+        )
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.connection = connections[self.using]
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.defer_indexes = (
+            not options['keep_indexes']
+            and self.connection.vendor in INDEX_QUERIES
+        )
+        self.buffers = {}
+        self.m2m_buffers = {}
+        self.deferred_indexes = []
+        self.loaded = {}
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stream = stack.enter_context(open_dump(options['dump']))
+            stack.enter_context(transaction.atomic(using=self.using))
+            stack.enter_context(self.connection.constraint_checks_disabled())
+            try:
+                objects = serializers.deserialize(
+                    'python', iter_json_objects(stream), using=self.using
+                )
+                for count, obj in enumerate(objects, 1):
+                    self.add(obj)
+                    if count % options['progress_every'] == 0:
+                        self.report_progress(count, started)
+                for model in list(self.buffers):
+                    self.flush(model)
+            except (ValueError, serializers.base.DeserializationError) as e:
+                raise CommandError(f'Ошибка разбора дампа: {e}')
+            except IntegrityError as e:
+                raise CommandError(
+                    f'{e}. Если часть строк уже есть в базе, '
+                    'запустите команду с --ignore-conflicts.'
+                )
+            # При ошибке удалённые индексы вернёт откат транзакции.
+            self.restore_indexes()
+            self.connection.check_constraints(
+                table_names=[model._meta.db_table for model in self.loaded]
+            )
+            self.reset_sequences()
+
+        total = sum(self.loaded.values())
+        self.report_progress(total, started)
+        for model, count in self.loaded.items():
+            self.stdout.write(f'  {model._meta.label}: {count}')
+
+    def add(self, deserialized):
+        model = type(deserialized.object)
+        if model not in self.buffers:
+            self.buffers[model] = []
+            self.drop_indexes(model)
+        self.buffers[model].append(deserialized.object)
+        for field_name, values in (deserialized.m2m_data or {}).items():
+            if deserialized.object.pk is None:
+                continue
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            buffer = self.m2m_buffers.setdefault((model, through), [])
+            buffer.extend(
+                through(**{
+                    field.m2m_field_name(): deserialized.object.pk,
+                    field.m2m_reverse_field_name(): value,
+                })
+                for value in values
+            )
+        if len(self.buffers[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        """Записывает накопленные объекты модели и её связи M2M."""
+        with preserved_timestamps(model):
+            model._base_manager.using(self.using).bulk_create(
+                self.buffers[model],
+                batch_size=self.batch_size,
+                ignore_conflicts=self.ignore_conflicts,
+            )
+        self.loaded[model] = (
+            self.loaded.get(model, 0) + len(self.buffers[model])
+        )
+        self.buffers[model] = []
+        for (owner, through), rows in self.m2m_buffers.items():
+            if owner is model and rows:
+                through._base_manager.using(self.using).bulk_create(
+                    rows,
+                    batch_size=self.batch_size,
+                    ignore_conflicts=self.ignore_conflicts,
+                )
+                self.loaded[through] = self.loaded.get(through, 0) + len(rows)
+                rows.clear()
+
+    def drop_indexes(self, model):
+        """Удаляет неуникальные индексы таблицы до конца загрузки."""
+        if not self.defer_indexes:
+            return
+        quote_name = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                INDEX_QUERIES[self.connection.vendor],
+                [model._meta.db_table],
+            )
+            for name, sql in cursor.fetchall():
+                if 'UNIQUE' in sql.upper():
+                    continue
+                cursor.execute(f'DROP INDEX {quote_name(name)}')
+                self.deferred_indexes.append(sql)
+
+    def restore_indexes(self):
+        with self.connection.cursor() as cursor:
+            for sql in self.deferred_indexes:
+                cursor.execute(sql)
+        self.deferred_indexes = []
+
+    def reset_sequences(self):
+        """Сдвигает счётчики первичных ключей за загруженные значения."""
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), list(self.loaded)
+        )
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def report_progress(self, count, started):
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Загружено объектов: {count} '
+            f'за {elapsed:.1f} с ({rate:.0f} объектов/с)'
+        )
@@ -0,0 +1,92 @@
+"""Нагрузочное тестирование блога по встроенным сценариям."""
+
+import json
+import subprocess
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.loadtest import SCENARIOS, ScenarioRunner
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает сценарии нагрузки (анонимный просмотр, комментирование, '
+        'создание постов, глубокая пагинация) тестовым клиентом или по HTTP '
+        'и сохраняет RPS, перцентили задержек и долю ошибок в JSON. '
+        'Сценарии с записью меняют данные в базе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*',
+            help=f"Сценарии ({', '.join(SCENARIOS)}); по умолчанию все."
+        )
+        parser.add_argument(
+            '--target', default='client',
+            help='client — тестовый клиент в процессе, либо адрес сервера '
+                 '(http://127.0.0.1:8000). По HTTP пользователи входят '
+                 'с паролем, заданным командой seed.'
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument(
+            '--compare', help='Предыдущий отчёт для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(
+                f"Неизвестные сценарии: {', '.join(sorted(unknown))}"
+            )
+        report = {
+            'commit': current_commit(),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'target': options['target'],
+            'scenarios': {},
+        }
+        for name in names:
+            report['scenarios'][name] = ScenarioRunner(
+                SCENARIOS[name](),
+                options['target'],
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                seed=options['seed'],
+            ).run()
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(text)
+        self.stdout.write(text)
+        if options['compare']:
+            self.compare(report, options['compare'])
+
+    def compare(self, report, path):
+        """Печатает изменение RPS и p95 относительно прошлого отчёта."""
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        self.stdout.write(f"Сравнение с {baseline.get('commit') or path}:")
+        for name, current in report['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+            if not previous:
+                continue
+            self.stdout.write(
+                f"  {name}: RPS {previous['rps']} -> {current['rps']}, "
+                f"p95 {previous['latency'].get('p95_ms')} -> "
+                f"{current['latency'].get('p95_ms')} мс, "
+                f"ошибки {previous['error_rate']} -> {current['error_rate']}"
+            )
@@ -0,0 +1,65 @@
+"""Профиль холодного запуска: время импорта по пакетам."""
+
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.benchmark import summarize
+from blog.startup import aggregate, measure_startup
+
+
+def env_pair(value):
+    name, separator, setting = value.partition('=')
+    if not separator or not name:
+        raise ValueError(value)
+    return name, setting
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает отдельный процесс с python -X importtime, импортирует '
+        'модуль приложения и URLconf и печатает время импорта по пакетам '
+        'и общее время запуска.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', default='blogicum.wsgi',
+            help='Модуль, импорт которого считается запуском воркера.'
+        )
+        parser.add_argument(
+            '--env', type=env_pair, action='append', default=[],
+            metavar='NAME=VALUE',
+            help='Переменная окружения процесса, например DEV_TOOLS=0.'
+        )
+        parser.add_argument(
+            '--depth', type=int, default=1,
+            help='Уровень пакетов при суммировании (1 — django, 2 — '
+                 'django.db).'
+        )
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Число запусков для оценки общего времени.'
+        )
+
+    def handle(self, *args, **options):
+        env = dict(options['env'])
+        runs = []
+        for _ in range(max(1, options['repeat'])):
+            try:
+                runs.append(measure_startup(options['target'], env))
+            except subprocess.CalledProcessError as error:
+                raise CommandError(
+                    'Процесс не запустился:\n' + error.stderr[-2000:]
+                )
+        wall = summarize([run['wall_ms'] / 1000 for run in runs])
+        fastest = min(runs, key=lambda run: run['import_ms'])
+        self.stdout.write(
+            f'Запуск: p50 {wall["p50_ms"]} мс, max {wall["max_ms"]} мс; '
+            f'импорт {fastest["import_ms"]} мс, '
+            f'модулей {len(fastest["modules"])}'
+        )
+        packages = aggregate(fastest['modules'], options['depth'])
+        for package, own_ms, count in packages[:options['top']]:
+            self.stdout.write(f'  {own_ms:8.1f} мс  {count:4}  {package}')
@@ -0,0 +1,16 @@
+"""Полный пересчёт таблицы AuthorStats."""
+
+from django.core.management.base import BaseCommand
+
+from blog.stats import rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает статистику всех авторов. Нужна после загрузки '
+        'данных в обход сигналов (importdump, seed, bulk-операции).'
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_author_stats()
+        self.stdout.write(f'Пересчитана статистика авторов: {count}')
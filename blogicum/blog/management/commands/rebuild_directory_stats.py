@@ -0,0 +1,20 @@
+"""Полный пересчёт счётчиков страниц /categories/ и /locations/."""
+
+from django.core.management.base import BaseCommand
+from django.utils.text import capfirst
+
+from blog.stats import rebuild_directory_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает CategoryStats и LocationStats. Нужна после загрузки '
+        'данных в обход сигналов и периодически (например, из cron), '
+        'чтобы учесть отложенные посты, время публикации которых настало.'
+    )
+
+    def handle(self, *args, **options):
+        for model, count in rebuild_directory_stats().items():
+            self.stdout.write(
+                f'{capfirst(model._meta.verbose_name_plural)}: {count}'
+            )
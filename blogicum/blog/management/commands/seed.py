@@ -0,0 +1,317 @@
+"""Генератор синтетических данных для нагрузочного тестирования."""
+
+import bisect
+import itertools
+import random
+import time
+from datetime import timedelta
+from io import BytesIO
+from multiprocessing import Pool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import capfirst, slugify
+from faker import Faker
+from PIL import Image
+
+from blog.geo import grid_cell
+from blog.models import Category, Comment, Location, Post, User
+
+IMAGE_DIR = 'post_images'
+IMAGE_VARIANTS = 16
+SEED_PASSWORD = 'seed-password'
+# Область, в которой случайно размещаются местоположения.
+LATITUDES = (41.0, 70.0)
+LONGITUDES = (20.0, 60.0)
+
+
+def _faker(seed, kind, start):
+    fake = Faker('ru_RU')
+    fake.seed_instance(f'{seed}-{kind}-{start}')
+    return fake, random.Random(f'{seed}-{kind}-{start}')
+
+
+def generate_posts(task):
+    """Поля постов с номерами ``start``..``start + count``.
+
+    Выполняется в отдельном процессе; результат зависит только от
+    ``seed`` и номера блока, а не от числа процессов.
+    """
+    seed, start, count, params = task
+    fake, rng = _faker(seed, 'posts', start)
+    rows = []
+    for number in range(start, start + count):
+        if rng.random() < params['future_ratio']:
+            offset = timedelta(minutes=rng.randint(1, params['days'] * 1440))
+        else:
+            offset = -timedelta(minutes=rng.randint(0, params['days'] * 1440))
+        rows.append({
+            'id': params['first_id'] + number,
+            'title': fake.sentence(nb_words=rng.randint(2, 6))[:-1],
+            'text': fake.paragraph(nb_sentences=rng.randint(2, 12)),
+            'offset': offset,
+            'author': rng.randrange(params['users']),
+            'category': rng.randrange(params['categories']),
+            'location': (
+                rng.randrange(params['locations'])
+                if params['locations'] and rng.random() < 0.8 else None
+            ),
+            'image': (
+                rng.randrange(IMAGE_VARIANTS)
+                if rng.random() < params['image_ratio'] else None
+            ),
+            'is_published': rng.random() >= params['unpublished_ratio'],
+        })
+    return rows
+
+
+_zipf_cache = {}
+
+
+def _zipf_weights(seed, posts, exponent):
+    """Накопленные веса Zipf по постам в случайном порядке популярности.
+
+    Считаются один раз на процесс.
+    """
+    key = (seed, posts, exponent)
+    if key not in _zipf_cache:
+        ranks = list(range(1, posts + 1))
+        random.Random(f'{seed}-zipf').shuffle(ranks)
+        _zipf_cache.clear()
+        _zipf_cache[key] = list(
+            itertools.accumulate(1 / rank ** exponent for rank in ranks)
+        )
+    return _zipf_cache[key]
+
+
+def generate_comments(task):
+    """Поля комментариев блока; пост выбирается по распределению Zipf."""
+    seed, start, count, params = task
+    fake, rng = _faker(seed, 'comments', start)
+    weights = _zipf_weights(seed, params['posts'], params['zipf'])
+    total = weights[-1]
+    return [
+        {
+            'text': fake.sentence(nb_words=rng.randint(3, 25)),
+            'post': bisect.bisect_left(weights, rng.random() * total),
+            'author': rng.randrange(params['users']),
+        }
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями, '
+        'местоположениями, постами и комментариями. Число комментариев '
+        'на пост распределено по закону Zipf. Результат определяется '
+        'значением --seed. Сигналы post_save не отправляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения комментариев по постам.'
+        )
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--future-ratio', type=float, default=0.02)
+        parser.add_argument('--unpublished-ratio', type=float, default=0.02)
+        parser.add_argument('--image-ratio', type=float, default=0.1)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--workers', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.options = options
+        if options['posts'] and not (options['users']
+                                     and options['categories']):
+            raise CommandError(
+                'Для постов нужны хотя бы один пользователь и одна категория.'
+            )
+        started = time.perf_counter()
+        self.now = timezone.now().replace(
+            hour=12, minute=0, second=0, microsecond=0
+        )
+        with transaction.atomic():
+            self.user_ids = self.create_users()
+            self.category_ids = self.create_categories()
+            self.location_ids = self.create_locations()
+            self.images = self.create_images()
+            self.post_ids = self.create_posts()
+            self.create_comments()
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - started:.1f} с.'
+        )
+
+    def next_id(self, model):
+        return (model.objects.aggregate(models.Max('pk'))['pk__max'] or 0) + 1
+
+    def blocks(self, total, params):
+        size = self.options['batch_size']
+        return [
+            (self.options['seed'], start, min(size, total - start), params)
+            for start in range(0, total, size)
+        ]
+
+    def generate(self, function, tasks):
+        """Генерирует блоки в пуле процессов, сохраняя порядок."""
+        if self.options['workers'] <= 1:
+            yield from map(function, tasks)
+            return
+        with Pool(self.options['workers']) as pool:
+            yield from pool.imap(function, tasks)
+
+    def report(self, model, count):
+        self.stdout.write(
+            f'{capfirst(model._meta.verbose_name_plural)}: {count}'
+        )
+
+    def create_users(self):
+        fake, _ = _faker(self.options['seed'], 'users', 0)
+        first_id = self.next_id(User)
+        password = make_password(SEED_PASSWORD)
+        users = [
+            User(
+                id=first_id + number,
+                username=f'seed{self.options["seed"]}_user{number}',
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                email=f'user{number}@example.com',
+                password=password,
+            )
+            for number in range(self.options['users'])
+        ]
+        User.objects.bulk_create(users, self.options['batch_size'])
+        self.report(User, len(users))
+        return [user.id for user in users]
+
+    def create_categories(self):
+        fake, _ = _faker(self.options['seed'], 'categories', 0)
+        first_id = self.next_id(Category)
+        categories = []
+        for number in range(self.options['categories']):
+            title = fake.sentence(nb_words=2)[:-1]
+            categories.append(Category(
+                id=first_id + number,
+                title=title,
+                description=fake.paragraph(),
+                slug=f'seed{self.options["seed"]}-{number}-'
+                     f'{slugify(title, allow_unicode=False)}'[:50],
+            ))
+        Category.objects.bulk_create(categories, self.options['batch_size'])
+        self.report(Category, len(categories))
+        return [category.id for category in categories]
+
+    def create_locations(self):
+        fake, rng = _faker(self.options['seed'], 'locations', 0)
+        first_id = self.next_id(Location)
+        locations = []
+        for number in range(self.options['locations']):
+            latitude = rng.uniform(*LATITUDES)
+            longitude = rng.uniform(*LONGITUDES)
+            locations.append(Location(
+                id=first_id + number,
+                name=fake.city(),
+                latitude=latitude,
+                longitude=longitude,
+                grid_cell=grid_cell(latitude, longitude),
+            ))
+        Location.objects.bulk_create(locations, self.options['batch_size'])
+        self.report(Location, len(locations))
+        return [location.id for location in locations]
+
+    def create_images(self):
+        """Небольшой набор картинок, общих для всех постов."""
+        if not self.options['image_ratio']:
+            return []
+        rng = random.Random(f'{self.options["seed"]}-images')
+        names = []
+        for number in range(IMAGE_VARIANTS):
+            name = f'{IMAGE_DIR}/seed_{self.options["seed"]}_{number}.png'
+            if not default_storage.exists(name):
+                buffer = BytesIO()
+                Image.new(
+                    'RGB', (640, 480),
+                    tuple(rng.randrange(256) for _ in range(3)),
+                ).save(buffer, format='PNG')
+                buffer.seek(0)
+                name = default_storage.save(name, buffer)
+            names.append(name)
+        return names
+
+    def create_posts(self):
+        params = {
+            'first_id': self.next_id(Post),
+            'days': self.options['days'],
+            'future_ratio': self.options['future_ratio'],
+            'unpublished_ratio': self.options['unpublished_ratio'],
+            'image_ratio': self.options['image_ratio'] if self.images else 0,
+            'users': len(self.user_ids),
+            'categories': len(self.category_ids),
+            'locations': len(self.location_ids),
+        }
+        count = 0
+        for rows in self.generate(
+            generate_posts, self.blocks(self.options['posts'], params)
+        ):
+            Post.objects.bulk_create(
+                [
+                    Post(
+                        id=row['id'],
+                        title=row['title'][:settings.MAX_LENGTH_TITLE],
+                        text=row['text'],
+                        pub_date=self.now + row['offset'],
+                        author_id=self.user_ids[row['author']],
+                        category_id=self.category_ids[row['category']],
+                        location_id=(
+                            None if row['location'] is None
+                            else self.location_ids[row['location']]
+                        ),
+                        image=(
+                            '' if row['image'] is None
+                            else self.images[row['image']]
+                        ),
+                        is_published=row['is_published'],
+                    )
+                    for row in rows
+                ],
+                self.options['batch_size'],
+            )
+            count += len(rows)
+        self.report(Post, count)
+        return range(params['first_id'], params['first_id'] + count)
+
+    def create_comments(self):
+        if not self.post_ids:
+            return
+        params = {
+            'posts': len(self.post_ids),
+            'users': len(self.user_ids),
+            'zipf': self.options['zipf'],
+        }
+        count = 0
+        for rows in self.generate(
+            generate_comments, self.blocks(self.options['comments'], params)
+        ):
+            Comment.objects.bulk_create(
+                [
+                    Comment(
+                        text=row['text'],
+                        post_id=self.post_ids[row['post']],
+                        author_id=self.user_ids[row['author']],
+                    )
+                    for row in rows
+                ],
+                self.options['batch_size'],
+            )
+            count += len(rows)
+        self.report(Comment, count)
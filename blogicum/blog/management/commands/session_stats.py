@@ -0,0 +1,74 @@
+"""Размер таблицы сессий и накладные расходы сессии на запрос."""
+
+import json
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count
+from django.db.models.functions import Length, TruncDate
+from django.utils import timezone
+
+from blog.benchmark import summarize, timed
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает число живых и устаревших сессий, рост таблицы '
+        'по дням и время загрузки/сохранения сессии текущим SESSION_ENGINE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--days', type=int, default=14)
+
+    def handle(self, *args, **options):
+        report = {
+            'engine': settings.SESSION_ENGINE,
+            'table': self.table_stats(options['days']),
+            'overhead': self.overhead(options['iterations']),
+        }
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+    def table_stats(self, days):
+        now = timezone.now()
+        sessions = Session.objects.all()
+        # Сессия создаётся или продлевается на SESSION_COOKIE_AGE,
+        # поэтому день истечения со сдвигом даёт день записи.
+        age = timedelta(seconds=settings.SESSION_COOKIE_AGE)
+        growth = (
+            sessions.filter(expire_date__gte=now - timedelta(days) + age)
+            .annotate(day=TruncDate('expire_date'))
+            .values('day').annotate(count=Count('pk')).order_by('day')
+        )
+        return {
+            'total': sessions.count(),
+            'expired': sessions.filter(expire_date__lt=now).count(),
+            'avg_data_bytes': sessions.aggregate(
+                size=Avg(Length('session_data'))
+            )['size'],
+            'written_per_day': {
+                str(row['day'] - age): row['count'] for row in growth
+            },
+        }
+
+    def overhead(self, iterations):
+        """Время загрузки существующей сессии и записи изменённой."""
+        store_class = import_module(settings.SESSION_ENGINE).SessionStore
+        store = store_class()
+        store['_auth_user_id'] = '1'
+        store.save()
+        session_key = store.session_key
+        load, save = [], []
+        for number in range(iterations):
+            session = store_class(session_key)
+            with timed(load):
+                session.load()
+            session['counter'] = number
+            with timed(save):
+                session.save()
+            session_key = session.session_key
+        store_class(session_key).delete()
+        return {'load': summarize(load), 'save': summarize(save)}
@@ -0,0 +1,38 @@
+"""Компиляция всех шаблонов проекта."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.template_loaders import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Компилирует все шаблоны и печатает время компиляции. Ошибки '
+        'синтаксиса завершают команду с ненулевым кодом, поэтому её '
+        'удобно запускать перед деплоем. Серверный процесс прогревает '
+        'кэш сам при TEMPLATE_WARMUP.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slowest', type=int, default=10,
+            help='Сколько самых медленных шаблонов показать.'
+        )
+
+    def handle(self, *args, **options):
+        results = warm_templates()
+        total = sum(seconds for _, seconds, _ in results)
+        cache_state = 'включён' if settings.TEMPLATE_CACHE else 'выключен'
+        self.stdout.write(
+            f'Шаблонов: {len(results)}, компиляция {total * 1000:.1f} мс '
+            f'(кэш шаблонов {cache_state})'
+        )
+        slowest = sorted(results, key=lambda result: result[1], reverse=True)
+        for name, seconds, _ in slowest[:options['slowest']]:
+            self.stdout.write(f'  {seconds * 1000:8.2f} мс  {name}')
+        errors = [(name, error) for name, _, error in results if error]
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-19 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_author_stats(apps, schema_editor):
+    from blog.stats import rebuild_author_stats
+    rebuild_author_stats(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('published_post_count', models.PositiveIntegerField(default=0, help_text='Публикации с отметкой «Опубликовано».', verbose_name='Опубликовано')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_post_date', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация добавлена')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(
+            backfill_author_stats, migrations.RunPython.noop
+        ),
+    ]
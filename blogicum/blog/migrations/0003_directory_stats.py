@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-19 00:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_directory_stats(apps, schema_editor):
+    from blog.stats import rebuild_directory_stats
+    rebuild_directory_stats(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_author_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationStats',
+            fields=[
+                ('published_post_count', models.PositiveIntegerField(default=0, help_text='Посты, видимые в ленте на момент пересчёта.', verbose_name='Опубликовано')),
+                ('location', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='blog.location', verbose_name='Местоположение')),
+                ('latest_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.post', verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика местоположения',
+                'ordering': ('location__name',),
+                'verbose_name_plural': 'Статистика местоположений',
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('published_post_count', models.PositiveIntegerField(default=0, help_text='Посты, видимые в ленте на момент пересчёта.', verbose_name='Опубликовано')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='blog.category', verbose_name='Категория')),
+                ('latest_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.post', verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика категории',
+                'ordering': ('category__title',),
+                'verbose_name_plural': 'Статистика категорий',
+            },
+        ),
+        migrations.RunPython(
+            backfill_directory_stats, migrations.RunPython.noop
+        ),
+    ]
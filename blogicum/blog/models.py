@@ -1,11 +1,15 @@
 """Классы для работы с SQLite."""
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.urls import reverse
 from django.utils import timezone
 
+from .fast_urls import fast_url
+from .geo import grid_cell
+
 
 User = get_user_model()
 
@@ -53,12 +57,36 @@ class Category(PublishedModel):
         """
         return self.title[:settings.PRE_TEXT_LEN]
 
+    @property
+    def url(self):
+        """Адрес ленты категории."""
+        return fast_url('blog:category_posts', self.slug)
+
 
 class Location(PublishedModel):
     """Класс описывающий таблицу Location в БД."""
 
     name = models.CharField(verbose_name='Название места',
                             max_length=settings.MAX_LENGTH_TITLE)
+    latitude = models.FloatField(
+        verbose_name='Широта',
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        verbose_name='Долгота',
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    grid_cell = models.PositiveIntegerField(
+        verbose_name='Ячейка сетки',
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text='Вычисляется из координат при сохранении.'
+    )
 
     class Meta:
         verbose_name = 'местоположение'
@@ -70,6 +98,19 @@ class Location(PublishedModel):
         """
         return self.name[:settings.PRE_TEXT_LEN]
 
+    def clean(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValidationError(
+                'Укажите обе координаты или ни одной.'
+            )
+
+    def save(self, *args, **kwargs):
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'grid_cell'}
+        super().save(*args, **kwargs)
+
 
 class Post(PublishedModel):
     """Класс описывающий таблицу Post в БД."""
@@ -125,7 +166,17 @@ class Post(PublishedModel):
         return self.title[:settings.PRE_TEXT_LEN]
 
     def get_absolute_url(self):
-        return reverse('blog:post_detail', kwargs={"pk": self.pk})
+        return fast_url('blog:post_detail', self.pk)
+
+    @property
+    def url(self):
+        """Адрес страницы поста."""
+        return self.get_absolute_url()
+
+    @property
+    def author_url(self):
+        """Адрес профиля автора поста."""
+        return fast_url('blog:profile', self.author.username)
 
 
 class Comment(models.Model):
@@ -159,3 +210,112 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+
+
+class AuthorStats(models.Model):
+    """Счётчики автора, поддерживаемые сигналами при записи постов
+    и комментариев. Полный пересчёт — команда rebuild_author_stats.
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Автор',
+        related_name='stats'
+    )
+    post_count = models.PositiveIntegerField(
+        verbose_name='Публикаций', default=0
+    )
+    published_post_count = models.PositiveIntegerField(
+        verbose_name='Опубликовано',
+        default=0,
+        help_text='Публикации с отметкой «Опубликовано».'
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Комментариев', default=0
+    )
+    last_post_date = models.DateTimeField(
+        verbose_name='Последняя публикация добавлена',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        """Метод используется для получения
+        «читаемого» представления объекта.
+        """
+        return str(self.author)[:settings.PRE_TEXT_LEN]
+
+
+class DirectoryStats(models.Model):
+    """Абстрактная модель счётчиков для страниц-каталогов: число
+    опубликованных постов и последний из них.
+    """
+
+    published_post_count = models.PositiveIntegerField(
+        verbose_name='Опубликовано',
+        default=0,
+        help_text='Посты, видимые в ленте на момент пересчёта.'
+    )
+    latest_post = models.ForeignKey(
+        Post,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='Последняя публикация',
+        related_name='+'
+    )
+
+    class Meta:
+        abstract = True
+
+
+class CategoryStats(DirectoryStats):
+    """Счётчики категории для страницы /categories/."""
+
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Категория',
+        related_name='stats'
+    )
+
+    class Meta:
+        verbose_name = 'статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+        ordering = ('category__title',)
+
+    def __str__(self):
+        """Метод используется для получения
+        «читаемого» представления объекта.
+        """
+        return str(self.category)
+
+
+class LocationStats(DirectoryStats):
+    """Счётчики местоположения для страницы /locations/."""
+
+    location = models.OneToOneField(
+        Location,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Местоположение',
+        related_name='stats'
+    )
+
+    class Meta:
+        verbose_name = 'статистика местоположения'
+        verbose_name_plural = 'Статистика местоположений'
+        ordering = ('location__name',)
+
+    def __str__(self):
+        """Метод используется для получения
+        «читаемого» представления объекта.
+        """
+        return str(self.location)
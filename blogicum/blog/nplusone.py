@@ -0,0 +1,130 @@
+"""Поиск N+1: повторяющихся SELECT одной формы в пределах запроса.
+
+Если представление забыло ``select_related``, каждая карточка ленты
+делает свой запрос за автором, категорией или местоположением. Такие
+запросы отличаются только параметрами, поэтому у них один отпечаток
+(``blog.querylog.fingerprint``). ``NPlusOneMiddleware`` считает SELECT
+по отпечаткам и сообщает о тех, что повторились NPLUSONE_THRESHOLD раз,
+вместе со строкой шаблона или кода, которая их вызвала.
+"""
+
+import logging
+import sys
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Node, TokenType
+
+from .sqlmonitor import cached_fingerprint, origin_frame
+
+logger = logging.getLogger('blog.nplusone')
+
+
+class NPlusOneError(Exception):
+    """Запрос к странице выполнил повторяющиеся SELECT."""
+
+
+def template_origin():
+    """Ближайший узел шаблона на стеке: «шаблон:строка {{ выражение }}»."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code is Node.render_annotated.__code__:
+            node = frame.f_locals['self']
+            token = getattr(node, 'token', None)
+            if token is not None and node.origin is not None:
+                if token.token_type == TokenType.VAR:
+                    contents = f'{{{{ {token.contents} }}}}'
+                else:
+                    contents = f'{{% {token.contents} %}}'
+                name = node.origin.template_name or node.origin.name
+                return f'{name}:{token.lineno} {contents}'
+        frame = frame.f_back
+    return None
+
+
+class QueryCounter:
+    """Execute wrapper: число SELECT по отпечаткам и место повтора."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            key = cached_fingerprint(sql)
+            self.counts[key] += 1
+            if self.counts[key] == self.threshold:
+                self.origins[key] = template_origin() or origin_frame()
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        """Список (отпечаток, число запросов, место) сверх порога."""
+        return [
+            (key, count, self.origins.get(key))
+            for key, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+
+@contextmanager
+def counting(counter):
+    """Подключает ``counter`` ко всем соединениям внутри блока ``with``."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+def detect_nplusone(threshold=None):
+    """Считает SELECT на всех соединениях внутри блока ``with``."""
+    return counting(QueryCounter(threshold or settings.NPLUSONE_THRESHOLD))
+
+
+def describe(repeated, path):
+    lines = [f'N+1 на {path}:']
+    for key, count, origin in repeated:
+        lines.append(f'  {count} раз из {origin or "?"}: {key}')
+    return '\n'.join(lines)
+
+
+class NPlusOneMiddleware:
+    """Сообщает о N+1 в логе ``blog.nplusone`` или исключением.
+
+    Включается NPLUSONE_DETECT (по умолчанию при DEBUG); при
+    NPLUSONE_RAISE вместо записи в лог выбрасывается NPlusOneError.
+    У потокового ответа запросы считаются и во время его отдачи,
+    а отчёт формируется после последнего фрагмента.
+    """
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_DETECT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with detect_nplusone() as counter:
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.stream(
+                response.streaming_content, counter, request.path
+            )
+        else:
+            self.report(counter, request.path)
+        return response
+
+    def stream(self, content, counter, path):
+        with counting(counter):
+            yield from content
+        self.report(counter, path)
+
+    def report(self, counter, path):
+        repeated = counter.repeated()
+        if repeated:
+            message = describe(repeated, path)
+            if settings.NPLUSONE_RAISE:
+                raise NPlusOneError(message)
+            logger.warning(message)
@@ -0,0 +1,150 @@
+"""Выборочный профилировщик запросов со стеками для flame graph.
+
+Включается PROFILING=1; иначе ``ProfilingMiddleware`` не подключается
+(MiddlewareNotUsed) и запросы не замедляет. Профилируется доля запросов
+PROFILE_SAMPLE_RATE, запросы к адресам с префиксами из PROFILE_PATHS
+и запросы сотрудников с параметром ``?profile=1``.
+
+Пока профилируемый запрос выполняется, отдельный поток раз в
+PROFILE_INTERVAL_MS снимает стек его потока (``sys._current_frames``).
+Стеки дописываются в PROFILE_DIR/<представление>.collapsed в формате
+collapsed stack: «кадр;кадр;кадр число». Файл принимают flamegraph.pl
+и speedscope; эндпоинт ``/instrumentation/profiles/`` отдаёт его
+сотрудникам со сложенными одинаковыми стеками.
+"""
+
+import os
+import random
+import sys
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse, JsonResponse
+
+SUFFIX = '.collapsed'
+_write_lock = threading.Lock()
+
+
+def collapse(frame, root):
+    """Стек от кадра ``root`` до ``frame`` одной строкой; None без root."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        if code is root:
+            return ';'.join(reversed(names))
+        frame = frame.f_back
+    return None
+
+
+class Sampler(threading.Thread):
+    """Поток, снимающий стек потока ``thread_id`` раз в ``interval`` с."""
+
+    def __init__(self, thread_id, interval, root):
+        super().__init__(name='blog-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks = Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = frame and collapse(frame, self.root)
+            if stack:
+                self.stacks[stack] += 1
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        return self.stacks
+
+
+def profile_path(view):
+    return os.path.join(settings.PROFILE_DIR, view.replace(':', '.') + SUFFIX)
+
+
+def write_profile(view, stacks):
+    """Дописывает стеки запроса в файл представления."""
+    lines = ''.join(f'{stack} {count}\n' for stack, count in stacks.items())
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    with _write_lock, open(profile_path(view), 'a') as profile:
+        profile.write(lines)
+
+
+def read_profile(path):
+    """Стеки файла с суммой по одинаковым стекам."""
+    stacks = Counter()
+    with open(path) as profile:
+        for line in profile:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+class ProfilingMiddleware:
+    """Снимает стеки выбранных запросов и пишет их по представлениям."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rate = settings.PROFILE_SAMPLE_RATE
+        self.paths = tuple(settings.PROFILE_PATHS)
+        self.interval = settings.PROFILE_INTERVAL_MS / 1000
+
+    def should_profile(self, request):
+        if self.rate and random.random() < self.rate:
+            return True
+        if self.paths and request.path.startswith(self.paths):
+            return True
+        # request.user читает сессию, поэтому проверяется последним.
+        return 'profile' in request.GET and request.user.is_staff
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+        sampler = Sampler(
+            threading.get_ident(), self.interval, self.__call__.__code__
+        )
+        sampler.start()
+        try:
+            return self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+            match = request.resolver_match
+            if stacks:
+                write_profile(match.view_name if match else 'unresolved',
+                              stacks)
+
+
+@staff_member_required
+def profiles_view(request, view=None):
+    """Список профилей по представлениям или один профиль текстом."""
+    if view is None:
+        try:
+            names = sorted(
+                name for name in os.listdir(settings.PROFILE_DIR)
+                if name.endswith(SUFFIX)
+            )
+        except FileNotFoundError:
+            names = []
+        return JsonResponse({
+            name[:-len(SUFFIX)]: sum(read_profile(
+                os.path.join(settings.PROFILE_DIR, name)
+            ).values())
+            for name in names
+        }, json_dumps_params={'ensure_ascii': False})
+    try:
+        stacks = read_profile(profile_path(view))
+    except FileNotFoundError:
+        raise Http404
+    return HttpResponse(
+        ''.join(f'{stack} {count}\n' for stack, count in stacks.items()),
+        content_type='text/plain; charset=utf-8',
+    )
@@ -0,0 +1,133 @@
+"""Ограниченный журнал SQL-запросов и сводка по отпечаткам.
+
+При DEBUG Django сохраняет каждый запрос в ``connection.queries_log``:
+до 9000 записей с полным текстом SQL, а текст одного запроса
+``bulk_create`` занимает сотни килобайт. ``QueryLog`` хранит столько же
+запросов, но с обрезанным текстом. Число и время запросов
+по отпечатку — тексту SQL без значений — копит ``QueryStats``; её
+заполняет ``blog.sqlmonitor.QueryMonitor`` при любом значении DEBUG.
+"""
+
+import re
+import threading
+from collections import deque
+
+from django.conf import settings
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.I)
+SPACE = re.compile(r'\s+')
+# Список значений IN (...) или строка VALUES (...) любой длины.
+VALUES = re.compile(r'\((?:\?|NULL)(?:, (?:\?|NULL))*\)')
+ROWS = re.compile(r'\(\.\.\.\)(?:, \(\.\.\.\))+')
+# bulk_create в SQLite: SELECT ?, ? UNION ALL SELECT ?, ? ...
+UNION_ROW = r'SELECT (?:\?|NULL)(?:, (?:\?|NULL))*'
+UNION_ROWS = re.compile(rf'{UNION_ROW}(?: UNION ALL {UNION_ROW})+')
+# Отпечатки сверх QUERY_STATS_LIMIT учитываются под этим ключом.
+OTHER = '<прочие запросы>'
+
+
+def fingerprint(sql):
+    """Текст SQL без значений: запросы одной формы дают один отпечаток."""
+    sql = STRING.sub('?', sql).replace('%s', '?')
+    sql = SPACE.sub(' ', NUMBER.sub('?', sql)).strip()
+    sql = UNION_ROWS.sub('SELECT ... UNION ALL ...', sql)
+    return ROWS.sub('(...), ...', VALUES.sub('(...)', sql))
+
+
+class QueryStats:
+    """Число, суммарное и наибольшее время запросов по отпечаткам.
+
+    Общая для всех потоков процесса; число отпечатков ограничено.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit or settings.QUERY_STATS_LIMIT
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.plans = {}
+
+    def add(self, sql, duration, key=None):
+        """Учитывает запрос; возвращает его отпечаток."""
+        key = key or fingerprint(sql)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.limit:
+                    key = OTHER
+                entry = self._stats.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+        return key
+
+    def set_plan(self, key, plan):
+        """Сохраняет план запроса для отпечатка из сводки."""
+        with self._lock:
+            if key in self._stats:
+                self.plans[key] = plan
+
+    def top(self, count=20, order='total_ms'):
+        """Самые дорогие отпечатки по ``order`` (count, total_ms, max_ms)."""
+        with self._lock:
+            rows = [
+                {
+                    'fingerprint': key,
+                    'count': calls,
+                    'total_ms': round(total * 1000, 3),
+                    'max_ms': round(longest * 1000, 3),
+                    **(
+                        {'plan': self.plans[key]} if key in self.plans else {}
+                    ),
+                }
+                for key, (calls, total, longest) in self._stats.items()
+            ]
+        rows.sort(key=lambda row: row[order], reverse=True)
+        return rows[:count]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.plans.clear()
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_stats(alias):
+    """Сводка по отпечаткам для БД ``alias`` во всём процессе."""
+    with _stats_lock:
+        if alias not in _stats:
+            _stats[alias] = QueryStats()
+        return _stats[alias]
+
+
+def snapshot():
+    """Самые дорогие отпечатки каждой БД для эндпоинта метрик."""
+    with _stats_lock:
+        aliases = dict(_stats)
+    return {alias: stats.top() for alias, stats in aliases.items()}
+
+
+class QueryLog(deque):
+    """Замена ``connection.queries_log`` с обрезанным текстом SQL.
+
+    Размер тот же, что у журнала Django (``connection.queries_limit``):
+    CaptureQueriesContext и assertNumQueries считают запросы по длине
+    журнала и перестают их видеть, когда журнал заполнен. Django очищает
+    журнал в начале каждого запроса (``reset_queries``).
+    """
+
+    def __init__(self, maxlen):
+        super().__init__(maxlen=maxlen)
+        self.sql_length = settings.QUERY_LOG_SQL_LENGTH
+
+    def append(self, query):
+        sql = query['sql']
+        if len(sql) > self.sql_length:
+            query = {
+                **query,
+                'sql': f'{sql[:self.sql_length]}... ({len(sql)} символов)',
+            }
+        super().append(query)
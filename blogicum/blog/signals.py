@@ -0,0 +1,119 @@
+"""Обработчики сигналов приложения blog."""
+
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .caching import invalidate_user
+from .models import Category, CategoryStats, Comment, Location, Post, User
+from .stats import (
+    increment_author_stats,
+    move_post_in_directories,
+    refresh_author_stats,
+    refresh_directory_stats,
+    refresh_post_directories,
+)
+
+# Счётчики не меняются при loaddata (raw=True): фикстура может содержать
+# их сама, а иначе их пересчитывают rebuild_author_stats и
+# rebuild_directory_stats.
+
+# Поля поста, от которых зависят счётчики авторов и каталогов.
+POST_STATE_FIELDS = (
+    'author_id', 'is_published', 'category_id', 'location_id', 'pub_date'
+)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    """Запоминает username при загрузке, чтобы после переименования
+    сбросить кэш профиля по прежнему имени без запроса к БД.
+    """
+    instance._previous_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_username', None)
+    invalidate_user(instance, *filter(None, [previous]))
+    instance._previous_username = instance.username
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    """Запоминает поля поста, влияющие на счётчики, до его изменения."""
+    if kwargs.get('raw'):
+        return
+    instance._previous_state = (
+        sender._default_manager.filter(pk=instance.pk)
+        .values(*POST_STATE_FIELDS).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_stats_on_post_save(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    previous = getattr(instance, '_previous_state', None)
+    current = {field: getattr(instance, field) for field in POST_STATE_FIELDS}
+    if created or previous is None:
+        increment_author_stats(
+            instance.author_id,
+            last_post_date=instance.created_at,
+            post_count=1,
+            published_post_count=int(instance.is_published),
+        )
+    elif (previous['author_id'], previous['is_published']) != (
+        instance.author_id, instance.is_published
+    ):
+        for author_id in {previous['author_id'], instance.author_id}:
+            refresh_author_stats(author_id)
+    if previous != current:
+        move_post_in_directories(instance.pk, previous, current)
+
+
+@receiver(post_delete, sender=Post)
+def update_stats_on_post_delete(sender, instance, **kwargs):
+    refresh_author_stats(instance.author_id, create=False)
+    move_post_in_directories(
+        instance.pk,
+        {field: getattr(instance, field) for field in POST_STATE_FIELDS},
+        None,
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_stats_on_category_save(sender, instance, **kwargs):
+    """Снятие категории с публикации меняет счётчики её местоположений."""
+    if kwargs.get('raw'):
+        return
+    refresh_directory_stats(CategoryStats, instance.pk)
+    refresh_post_directories(*instance.posts.order_by().values(
+        'location_id'
+    ).distinct())
+
+
+@receiver(post_save, sender=Location)
+def update_stats_on_location_save(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    refresh_post_directories({'location_id': instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+def update_stats_on_comment_save(sender, instance, created, **kwargs):
+    if created and not kwargs.get('raw'):
+        increment_author_stats(instance.author_id, comment_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_stats_on_comment_delete(sender, instance, **kwargs):
+    increment_author_stats(
+        instance.author_id, create=False, comment_count=-1
+    )
@@ -0,0 +1,125 @@
+"""Учёт SQL-запросов по отпечаткам и журнал медленных запросов.
+
+``QueryMonitor`` подключается к каждому соединению как execute wrapper
+(``connection.execute_wrappers``) и работает независимо от DEBUG.
+Время запроса копится в ``blog.querylog.QueryStats`` по отпечатку.
+Запрос дольше SLOW_QUERY_MS пишется в лог ``blog.sql`` с представлением,
+которое его выполнило, и строкой кода проекта, откуда он вызван; для
+SELECT один раз на отпечаток сохраняется план ``EXPLAIN QUERY PLAN``.
+"""
+
+import logging
+import os
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils.deprecation import MiddlewareMixin
+
+from .querylog import fingerprint, get_stats
+
+logger = logging.getLogger('blog.sql')
+
+current_view = ContextVar('current_view', default=None)
+# Модули, кадры которых не считаются источником запроса.
+SKIPPED_FILES = (
+    os.path.join('blog', 'sqlmonitor.py'),
+    os.path.join('blog', 'db_backends'),
+)
+
+
+@lru_cache(maxsize=2048)
+def cached_fingerprint(sql):
+    """Отпечаток SQL с параметрами %s: текст запроса из ORM повторяется."""
+    return fingerprint(sql)
+
+
+def origin_frame():
+    """Ближайшая к запросу строка кода проекта (не Django и не библиотек)."""
+    root = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (
+            filename.startswith(root)
+            and 'site-packages' not in filename
+            and not any(part in filename for part in SKIPPED_FILES)
+        ):
+            return (
+                f'{os.path.relpath(filename, root)}:{frame.lineno} '
+                f'in {frame.name}'
+            )
+    return None
+
+
+class QueryMonitor:
+    """Execute wrapper: время запросов по отпечаткам и медленные запросы."""
+
+    def __init__(self, alias):
+        self.stats = get_stats(alias)
+        self.threshold = settings.SLOW_QUERY_MS / 1000
+        self.local = threading.local()
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(self.local, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            key = self.stats.add(sql, duration, cached_fingerprint(sql))
+            if duration >= self.threshold:
+                self.slow_query(key, sql, params, many, duration, context)
+
+    def slow_query(self, key, sql, params, many, duration, context):
+        plan = self.stats.plans.get(key)
+        if plan is None and not many and settings.SLOW_QUERY_EXPLAIN:
+            plan = self.explain(context['connection'], sql, params)
+            if plan is not None:
+                self.stats.set_plan(key, plan)
+        logger.warning(
+            'Медленный запрос %.1f мс, представление %s, код %s: %s%s',
+            duration * 1000,
+            current_view.get() or '-',
+            origin_frame() or '-',
+            key,
+            ''.join(f'\n    {line}' for line in (plan or '').splitlines()),
+            extra={
+                'duration': duration,
+                'fingerprint': key,
+                'view': current_view.get(),
+            },
+        )
+
+    def explain(self, connection, sql, params):
+        """План запроса SELECT или None."""
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return None
+        self.local.explaining = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'{connection.ops.explain_query_prefix()} {sql}', params
+                )
+                # В SQLite описание шага — последний столбец строки плана.
+                return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+        except DatabaseError:
+            return None
+        finally:
+            self.local.explaining = False
+
+
+class ViewContextMiddleware(MiddlewareMixin):
+    """Запоминает представление запроса для журнала медленных запросов."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        current_view.set(f'{view.__module__}.{view.__qualname__}')
+
+    def process_response(self, request, response):
+        current_view.set(None)
+        return response
@@ -0,0 +1,90 @@
+"""Замер холодного запуска процесса приложения.
+
+Процесс запускается с ``python -X importtime``: интерпретатор сам
+сообщает время импорта каждого модуля. Время модуля без вложенных
+импортов суммируется по пакетам, как в отчёте профилировщика.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+IMPORTTIME_LINE = re.compile(
+    r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)\s*$'
+)
+# Запуск воркера: модуль приложения и загрузка URLconf, которую
+# Django иначе откладывает до первого запроса.
+STARTUP_SCRIPT = (
+    'import importlib\n'
+    'importlib.import_module({target!r})\n'
+    'from django.urls import get_resolver\n'
+    'get_resolver().url_patterns\n'
+)
+
+
+def parse_importtime(output):
+    """Кортежи (модуль, собственное время, общее время, глубина) в мкс."""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, total, indent, module = match.groups()
+            rows.append(
+                (module, int(own), int(total), (len(indent) - 1) // 2)
+            )
+    return rows
+
+
+def aggregate(rows, level=1):
+    """Собственное время импорта по пакетам первых ``level`` уровней.
+
+    Возвращает список (пакет, мс, число модулей) по убыванию времени.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for module, own, _, _ in rows:
+        package = '.'.join(module.split('.')[:level])
+        totals[package][0] += own
+        totals[package][1] += 1
+    return sorted(
+        (
+            (package, round(own / 1000, 3), count)
+            for package, (own, count) in totals.items()
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+def measure_startup(target='blogicum.wsgi', env=None):
+    """Запускает отдельный процесс и возвращает время и импорты.
+
+    ``env`` дополняет окружение процесса, например ``{'DEV_TOOLS': '0'}``.
+    """
+    environment = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'blogicum.settings'
+        ),
+        **(env or {}),
+    }
+    started = time.perf_counter()
+    process = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime',
+            '-c', STARTUP_SCRIPT.format(target=target),
+        ],
+        cwd=settings.BASE_DIR, env=environment,
+        capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    modules = parse_importtime(process.stderr)
+    return {
+        'wall_ms': round(wall * 1000, 1),
+        'import_ms': round(sum(row[1] for row in modules) / 1000, 1),
+        'modules': modules,
+    }
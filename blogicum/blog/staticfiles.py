@@ -0,0 +1,148 @@
+"""Статика с хешированными именами, сжатием и встроенной отдачей.
+
+``CompressedManifestStaticFilesStorage`` при ``collectstatic`` кладёт
+рядом с текстовыми файлами сжатые копии ``.gz`` и, если установлен пакет
+``brotli``, ``.br``. ``StaticFilesMiddleware`` отдаёт содержимое
+``STATIC_ROOT`` из процесса приложения: для развёртываний без CDN
+и отдельного веб-сервера.
+"""
+
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from .compression import accepted_encodings, brotli
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico',
+}
+# Сжатая копия не сохраняется, если выигрыш меньше 5 %.
+MIN_COMPRESSION_RATIO = 0.95
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# Файлы без хеша в имени (например, не попавшие в манифест).
+MUTABLE_MAX_AGE = 60
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def compress(path):
+    """Создаёт сжатые копии файла; возвращает их пути."""
+    data = path.read_bytes()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data) * MIN_COMPRESSION_RATIO:
+            target = path.with_name(path.name + suffix)
+            target.write_bytes(compressed)
+            written.append(target)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хешированные имена и сжатые копии файлов для долгого кэширования."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            path = Path(self.path(name))
+            if path.suffix in COMPRESSIBLE_EXTENSIONS and path.exists():
+                compress(path)
+
+
+class StaticFile:
+    """Описание файла из STATIC_ROOT, собранное при запуске процесса."""
+
+    def __init__(self, path, immutable):
+        stat = path.stat()
+        self.path = path
+        self.content_type = (
+            mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        )
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.max_age = IMMUTABLE_MAX_AGE if immutable else MUTABLE_MAX_AGE
+        self.immutable = immutable
+        self.encodings = [
+            (encoding, path.with_name(path.name + suffix))
+            for encoding, suffix in ENCODINGS
+            if path.with_name(path.name + suffix).exists()
+        ]
+
+    def choose(self, accept_encoding):
+        """Путь к лучшему варианту файла и его Content-Encoding."""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, path in self.encodings:
+            if encoding in accepted:
+                return path, encoding
+        return self.path, None
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику до остальной обработки запроса.
+
+    Список файлов строится один раз при запуске: запрос к статике
+    стоит одного поиска в словаре. Включается настройкой SERVE_STATIC.
+    """
+
+    def __init__(self, get_response):
+        root = settings.STATIC_ROOT
+        if not settings.SERVE_STATIC or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.files = self.scan(Path(root))
+
+    def scan(self, root):
+        hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        files = {}
+        for path in root.rglob('*'):
+            if not path.is_file() or path.name.endswith(suffixes):
+                continue
+            name = path.relative_to(root).as_posix()
+            files[self.prefix + name] = StaticFile(path, name in hashed)
+        return files
+
+    def __call__(self, request):
+        static_file = self.files.get(request.path_info)
+        if static_file is None or request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    def serve(self, request, static_file):
+        if request.META.get('HTTP_IF_NONE_MATCH') == static_file.etag:
+            response = HttpResponseNotModified()
+        else:
+            path, encoding = static_file.choose(
+                request.META.get('HTTP_ACCEPT_ENCODING', '')
+            )
+            response = FileResponse(
+                open(path, 'rb'),
+                content_type=static_file.content_type,
+                filename=static_file.path.name,
+            )
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = static_file.etag
+        response['Last-Modified'] = static_file.last_modified
+        response['Cache-Control'] = (
+            f'public, max-age={static_file.max_age}'
+            + (', immutable' if static_file.immutable else '')
+        )
+        if static_file.encodings:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
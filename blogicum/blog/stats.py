@@ -0,0 +1,235 @@
+"""Поддержка таблиц счётчиков AuthorStats, CategoryStats, LocationStats."""
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .caching import invalidate_directory
+from .models import (
+    AuthorStats,
+    Category,
+    CategoryStats,
+    Comment,
+    LocationStats,
+    Post,
+)
+from .utils import published_posts_filter
+
+DIRECTORY_STATS = (CategoryStats, LocationStats)
+
+
+def _post_aggregates(posts):
+    return posts.values('author_id').annotate(
+        post_count=Count('pk'),
+        published_post_count=Count('pk', filter=Q(is_published=True)),
+        last_post_date=Max('created_at'),
+    )
+
+
+def refresh_author_stats(author_id, create=True):
+    """Пересчитывает статистику одного автора по индексу author_id.
+
+    При ``create=False`` существующая строка только обновляется: так
+    удаление пользователя каскадом не создаёт для него новую строку.
+    """
+    posts = _post_aggregates(
+        Post.objects.filter(author_id=author_id).order_by()
+    )
+    values = next(iter(posts), {})
+    defaults = {
+        'post_count': values.get('post_count', 0),
+        'published_post_count': values.get('published_post_count', 0),
+        'last_post_date': values.get('last_post_date'),
+        'comment_count': Comment.objects.filter(author_id=author_id).count(),
+    }
+    if create:
+        AuthorStats.objects.update_or_create(
+            author_id=author_id, defaults=defaults
+        )
+    else:
+        AuthorStats.objects.filter(author_id=author_id).update(**defaults)
+
+
+def increment_author_stats(author_id, last_post_date=None, create=True,
+                           **deltas):
+    """Сдвигает счётчики автора на ``deltas`` одним UPDATE."""
+    updates = {
+        field: F(field) + delta if delta >= 0
+        else Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+    }
+    if last_post_date is not None:
+        updates['last_post_date'] = Greatest(
+            Coalesce('last_post_date', last_post_date), last_post_date
+        )
+    updated = AuthorStats.objects.filter(author_id=author_id).update(
+        **updates
+    )
+    if not updated and create:
+        # Строки ещё нет: считаем с нуля, текущая запись уже в БД.
+        refresh_author_stats(author_id)
+
+
+@transaction.atomic
+def rebuild_author_stats(apps=global_apps):
+    """Полный пересчёт таблицы двумя агрегирующими запросами.
+
+    ``apps`` — реестр моделей; миграция передаёт исторический.
+    """
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    stats = {
+        author_id: AuthorStats(author_id=author_id)
+        for author_id in User.objects.values_list('pk', flat=True)
+    }
+    for row in _post_aggregates(Post.objects.order_by()):
+        author_stats = stats[row.pop('author_id')]
+        for field, value in row.items():
+            setattr(author_stats, field, value)
+    comments = Comment.objects.order_by().values('author_id').annotate(
+        count=Count('pk')
+    )
+    for row in comments:
+        stats[row['author_id']].comment_count = row['count']
+    AuthorStats.objects.all().delete()
+    AuthorStats.objects.bulk_create(stats.values(), batch_size=2000)
+    return len(stats)
+
+
+def _latest_visible_post(stats_model, item_id):
+    """Подзапрос: id последнего видимого поста категории или места."""
+    posts = stats_model._meta.get_field('latest_post').related_model
+    return posts.objects.filter(
+        published_posts_filter(), **{stats_model._meta.pk.name: item_id}
+    ).order_by('-pub_date').values('pk')[:1]
+
+
+def _directory_rows(stats_model, **filters):
+    """Тройки (id, число видимых постов, id последнего) для каталога."""
+    return stats_model._meta.pk.related_model.objects.filter(
+        **filters
+    ).annotate(
+        visible_posts=Count('posts', filter=published_posts_filter('posts__')),
+        latest_visible_post=Subquery(
+            _latest_visible_post(stats_model, OuterRef('pk'))
+        ),
+    ).order_by().values_list('pk', 'visible_posts', 'latest_visible_post')
+
+
+def refresh_directory_stats(stats_model, item_id):
+    """Пересчитывает строку каталога одной категории или местоположения."""
+    for pk, count, latest_post_id in _directory_rows(stats_model, pk=item_id):
+        stats_model.objects.update_or_create(
+            **{stats_model._meta.pk.attname: pk},
+            defaults={
+                'published_post_count': count,
+                'latest_post_id': latest_post_id,
+            },
+        )
+    invalidate_directory(stats_model)
+
+
+def is_visible(state):
+    """Виден ли в ленте пост с полями ``state``, как в published_posts_filter.
+
+    Публикация категории проверяется запросом по первичному ключу.
+    """
+    return bool(
+        state['is_published']
+        and timezone.localtime(state['pub_date']).date()
+        <= timezone.localdate()
+        and Category.objects.filter(
+            pk=state['category_id'], is_published=True
+        ).exists()
+    )
+
+
+def move_post_in_directories(post_id, previous, current):
+    """Сдвигает счётчики каталогов F()-выражениями при записи поста.
+
+    ``previous`` и ``current`` — поля поста до и после записи (None —
+    поста не было или его удалили). Полный пересчёт только у строки,
+    которой ещё нет; остальное — rebuild_directory_stats.
+    """
+    before = previous if previous and is_visible(previous) else {}
+    after = current if current and is_visible(current) else {}
+    for stats_model in DIRECTORY_STATS:
+        attname = stats_model._meta.pk.attname
+        old, new = before.get(attname), after.get(attname)
+        if old != new:
+            for item_id, delta in ((old, -1), (new, 1)):
+                if item_id is not None:
+                    _shift_directory_count(stats_model, item_id, delta)
+        if previous and previous[attname] is not None:
+            # Пост был последним (при удалении ссылку уже обнулил
+            # SET_NULL): последним становится следующий по дате.
+            stats_model.objects.filter(
+                Q(latest_post_id=post_id) | Q(latest_post__isnull=True),
+                pk=previous[attname],
+            ).update(latest_post=Subquery(
+                _latest_visible_post(stats_model, previous[attname])
+            ))
+        if new is not None:
+            stats_model.objects.filter(
+                Q(latest_post__isnull=True)
+                | Q(latest_post__pub_date__lt=after['pub_date']),
+                pk=new,
+            ).update(latest_post=post_id)
+        invalidate_directory(stats_model)
+
+
+def _shift_directory_count(stats_model, item_id, delta):
+    count = F('published_post_count') + delta
+    updated = stats_model.objects.filter(pk=item_id).update(
+        published_post_count=count if delta > 0 else Greatest(count, 0)
+    )
+    if not updated:
+        # Строки ещё нет: считаем с нуля, текущая запись уже в БД.
+        refresh_directory_stats(stats_model, item_id)
+
+
+def refresh_post_directories(*states):
+    """Обновляет каталоги для прежнего и нового состояния поста.
+
+    ``states`` — словари с ключами ``category_id`` и (или) ``location_id``.
+    """
+    for stats_model in DIRECTORY_STATS:
+        attname = stats_model._meta.pk.attname
+        for item_id in {state.get(attname) for state in states if state}:
+            if item_id is not None:
+                refresh_directory_stats(stats_model, item_id)
+
+
+@transaction.atomic
+def rebuild_directory_stats(apps=global_apps):
+    """Полный пересчёт каталогов; возвращает число строк по моделям.
+
+    ``apps`` — реестр моделей; миграция передаёт исторический.
+    """
+    counts = {}
+    for stats_model in (
+        apps.get_model('blog', 'CategoryStats'),
+        apps.get_model('blog', 'LocationStats'),
+    ):
+        attname = stats_model._meta.pk.attname
+        stats_model.objects.all().delete()
+        rows = stats_model.objects.bulk_create(
+            [
+                stats_model(**{
+                    attname: pk,
+                    'published_post_count': count,
+                    'latest_post_id': latest_post_id,
+                })
+                for pk, count, latest_post_id
+                in _directory_rows(stats_model).iterator()
+            ],
+            batch_size=2000,
+        )
+        counts[stats_model] = len(rows)
+        invalidate_directory(stats_model)
+    return counts
@@ -0,0 +1,52 @@
+"""Потоковый рендеринг длинных страниц.
+
+Страница рендерится «скелетом» без длинного списка: в место списка
+шаблон выводит маркер ``stream_marker``. Всё, что до маркера (шапка
+``base.html``, тело поста, форма), отдаётся клиенту сразу, затем
+порциями рендерится сам список, и в конце — остаток скелета.
+"""
+
+import secrets
+from itertools import islice
+
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+
+def chunked(iterable, size):
+    """Разбивает итерируемый объект на списки длиной ``size``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_template(request, template_name, context, *, items,
+                    item_template_name, items_name, chunk_size):
+    """Возвращает генератор HTML-фрагментов страницы с потоковым списком.
+
+    ``items`` — итерируемый объект (лучше ``queryset.iterator()``),
+    порции которого рендерятся шаблоном ``item_template_name``
+    с контекстом страницы и порцией под именем ``items_name``.
+    Скелет рендерится сразу, до выхода из представления, чтобы
+    middleware (например, CSRF) увидели его побочные эффекты.
+    """
+    marker = mark_safe(f'<!--stream:{secrets.token_hex(8)}-->')
+    skeleton = render_to_string(
+        template_name,
+        {**context, items_name: (), 'stream_marker': marker},
+        request,
+    )
+    head, tail = skeleton.split(marker, 1)
+
+    def generate():
+        yield head
+        for chunk in chunked(items, chunk_size):
+            yield render_to_string(
+                item_template_name, {**context, items_name: chunk}, request
+            )
+        yield tail
+
+    return generate()
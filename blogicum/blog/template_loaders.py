@@ -0,0 +1,213 @@
+"""Загрузчики шаблонов: удаление лишних пробелов и подстановка include
+при компиляции, прогрев кэша скомпилированных шаблонов.
+"""
+
+import logging
+import os
+import re
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.template import Origin, TemplateDoesNotExist, engines
+from django.template.loaders.base import Loader as BaseLoader
+
+NEWLINE_RUN = re.compile(r'[ \t]*\n\s*')
+SPACE_RUN = re.compile(r'[ \t]{2,}')
+# Строка, состоящая из одного тега: перевод строки после него
+# превращается в пустую строку в выводе.
+TAG_LINE = re.compile(r'^(\{%(?:(?!%\}).)*%\})\n', re.MULTILINE)
+# В таких шаблонах пробелы значимы, их не трогаем.
+logger = logging.getLogger('blog.templates')
+PRESERVE = re.compile(r'<(pre|textarea|script)\b', re.IGNORECASE)
+# Шаблоны писем — обычный текст: переводы строк в них значимы.
+PLAIN_TEXT = re.compile(r'_email\.html$')
+# Приложения проекта: их шаблоны и TEMPLATES_DIR минифицируются
+# и прогреваются при запуске.
+PROJECT_APPS = ('blog', 'pages')
+INCLUDE = re.compile(
+    r'\{%\s*include\s+(["\'])([^"\']+)\1(?:\s+with\s+((?:(?!%\}).)+?))?'
+    r'\s*%\}'
+)
+NOT_INLINABLE = re.compile(r'\{%\s*(extends|block)\b')
+INLINE_PREFIXES = ('includes/', 'blog/')
+MAX_INLINE_DEPTH = 5
+
+
+def project_template_dirs():
+    """TEMPLATES_DIR и каталоги templates приложений проекта."""
+    return [
+        settings.TEMPLATES_DIR,
+        *(
+            os.path.join(apps.get_app_config(label).path, 'templates')
+            for label in PROJECT_APPS
+        ),
+    ]
+
+
+def minify(source):
+    """Убирает отступы, пустые строки и переводы строк после тегов.
+
+    Каждая последовательность пробельных символов сохраняет хотя бы
+    один символ, поэтому видимый текст страницы не меняется.
+    """
+    if PRESERVE.search(source):
+        return source
+    source = NEWLINE_RUN.sub('\n', source)
+    source = SPACE_RUN.sub(' ', source)
+    return TAG_LINE.sub(r'\1', source)
+
+
+class WrappingLoader(BaseLoader):
+    """Оборачивает другие загрузчики и преобразует исходник шаблона
+    до компиляции. В связке с cached.Loader преобразование выполняется
+    один раз на шаблон.
+    """
+
+    def __init__(self, engine, loaders):
+        self.loaders = engine.get_template_loaders(loaders)
+        super().__init__(engine)
+
+    def get_dirs(self):
+        for loader in self.loaders:
+            if hasattr(loader, 'get_dirs'):
+                yield from loader.get_dirs()
+
+    def get_template_sources(self, template_name):
+        for loader in self.loaders:
+            for origin in loader.get_template_sources(template_name):
+                wrapped = Origin(origin.name, origin.template_name, self)
+                wrapped.source_origin = origin
+                yield wrapped
+
+    def get_source(self, origin):
+        """Исходник шаблона от обёрнутого загрузчика."""
+        return origin.source_origin.loader.get_contents(origin.source_origin)
+
+    def get_contents(self, origin):
+        contents = self.get_source(origin)
+        if origin.name.endswith('.html'):
+            return self.transform(contents, origin)
+        return contents
+
+    def transform(self, contents, origin):
+        raise NotImplementedError
+
+    def reset(self):
+        for loader in self.loaders:
+            if hasattr(loader, 'reset'):
+                loader.reset()
+
+
+class MinifyingLoader(WrappingLoader):
+    """Удаляет лишние пробелы из исходника HTML-шаблонов проекта.
+
+    Шаблоны Django и сторонних приложений (в том числе текстовые письма
+    ``registration/*_email.html``) не меняются.
+    """
+
+    def __init__(self, engine, loaders):
+        super().__init__(engine, loaders)
+        self.roots = tuple(
+            os.path.join(os.path.abspath(directory), '')
+            for directory in project_template_dirs()
+        )
+
+    def should_minify(self, origin):
+        return (
+            os.path.abspath(origin.name).startswith(self.roots)
+            and not PLAIN_TEXT.search(origin.template_name)
+        )
+
+    def transform(self, contents, origin):
+        if not self.should_minify(origin):
+            return contents
+        return minify(contents)
+
+
+class InliningLoader(WrappingLoader):
+    """Подставляет исходник статических ``{% include %}`` на место тега.
+
+    Include внутри цикла карточек на каждой итерации ищет шаблон
+    и добавляет слой контекста; после подстановки этого нет. Подставляются
+    только шаблоны из INLINE_PREFIXES без ``{% extends %}`` и ``{% block %}``;
+    ``with`` превращается в ``{% with %}``, include с ``only``,
+    с переменным именем шаблона или с рекурсией остаются как есть.
+    Номера строк в ошибках шаблона относятся к шаблону после подстановки.
+    """
+
+    def transform(self, contents, origin):
+        return self.inline(contents, (origin.template_name,))
+
+    def inline(self, contents, stack):
+        def replace(match):
+            name, extra = match.group(2), match.group(3)
+            if not self.can_inline(name, extra, stack):
+                return match.group(0)
+            source = self.find_source(name)
+            if source is None or NOT_INLINABLE.search(source):
+                return match.group(0)
+            source = self.inline(source, (*stack, name))
+            if extra:
+                return f'{{% with {extra} %}}{source}{{% endwith %}}'
+            return source
+
+        return INCLUDE.sub(replace, contents)
+
+    def can_inline(self, name, extra, stack):
+        words = extra.split() if extra else []
+        return (
+            name.startswith(INLINE_PREFIXES)
+            and name not in stack
+            and len(stack) <= MAX_INLINE_DEPTH
+            and 'only' not in words
+            and 'as' not in words
+        )
+
+    def find_source(self, template_name):
+        for origin in self.get_template_sources(template_name):
+            try:
+                return self.get_source(origin)
+            except TemplateDoesNotExist:
+                continue
+        return None
+
+
+def iter_template_names():
+    """Имена шаблонов проекта (без шаблонов Django и сторонних приложений)."""
+    names = set()
+    for directory in project_template_dirs():
+        for root, _, files in os.walk(directory):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                names.add(
+                    os.path.relpath(path, directory).replace(os.sep, '/')
+                )
+    return sorted(names)
+
+
+def warm_templates(backend='django'):
+    """Компилирует шаблоны проекта; с cached.Loader они остаются в памяти.
+
+    Возвращает список (имя, секунды, ошибка или None).
+    """
+    engine = engines[backend].engine
+    results = []
+    for name in iter_template_names():
+        started = time.perf_counter()
+        error = None
+        try:
+            engine.get_template(name)
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        results.append((name, time.perf_counter() - started, error))
+    return results
+
+
+def warm_up():
+    """Прогрев при запуске воркера: ошибки пишутся в лог, а шаблон
+    пропускается, чтобы воркер всё равно запустился.
+    """
+    for name, _, error in warm_templates():
+        if error:
+            logger.warning('Шаблон %s не прогрет: %s', name, error)
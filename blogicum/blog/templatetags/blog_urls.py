@@ -0,0 +1,13 @@
+"""Тег ``fast_url``: замена ``{% url %}`` для частых маршрутов ленты."""
+
+from django import template
+
+from blog.fast_urls import fast_url as build_url
+
+register = template.Library()
+
+
+@register.simple_tag(name='fast_url')
+def fast_url(name, *args):
+    """``{% fast_url 'blog:profile' post.author.username %}``."""
+    return build_url(name, *args)
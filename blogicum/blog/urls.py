@@ -1,9 +1,26 @@
 """URL маршруты приложения blog."""
 
+from django.conf import settings
 from django.urls import include, path
 
 from . import views
 
+if settings.ASYNC_FEED_VIEWS:
+    from . import async_views
+
+    feed_views = {
+        'index': async_views.AsyncPostsListView,
+        'post_detail': async_views.AsyncPostDetailView,
+        'profile': async_views.AsyncProfileDetailView,
+        'category_posts': async_views.AsyncCategoryListView,
+    }
+else:
+    feed_views = {
+        'index': views.PostsListView,
+        'post_detail': views.PostDetailView,
+        'profile': views.ProfileDetailView,
+        'category_posts': views.CategoryListView,
+    }
 
 app_name = 'blog'
 
@@ -16,7 +33,7 @@ post_urls = [
     ),
     path(
         '<int:post_id>/',
-        views.PostDetailView.as_view(),
+        feed_views['post_detail'].as_view(),
         name='post_detail'
     ),
     path(
@@ -49,18 +66,29 @@ profile_urls = [
     ),
     path(
         '<str:username>/',
-        views.ProfileDetailView.as_view(),
+        feed_views['profile'].as_view(),
         name='profile'
     ),
 ]
 
 urlpatterns = [
-    path('', views.PostsListView.as_view(), name='index'),
+    path('', feed_views['index'].as_view(), name='index'),
     path('posts/', include(post_urls)),
     path('profile/', include(profile_urls)),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryListView.as_view(),
+        feed_views['category_posts'].as_view(),
         name='category_posts'
     ),
+    path(
+        'categories/',
+        views.CategoryIndexView.as_view(),
+        name='category_index'
+    ),
+    path(
+        'locations/',
+        views.LocationIndexView.as_view(),
+        name='location_index'
+    ),
+    path('near/', views.NearbyPostsView.as_view(), name='nearby_posts'),
 ]
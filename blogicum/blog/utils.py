@@ -1,7 +1,7 @@
 """Файл с миксинами."""
 
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Count
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.urls import reverse
@@ -55,6 +55,17 @@ class CommentMixin:
         )
 
 
+def published_posts_filter(prefix=''):
+    """Условие видимости поста в ленте; ``prefix`` — путь к посту
+    от другой модели, например ``'posts__'``.
+    """
+    return Q(**{
+        f'{prefix}is_published': True,
+        f'{prefix}category__is_published': True,
+        f'{prefix}pub_date__date__lte': timezone.localtime(timezone.now()),
+    })
+
+
 def get_optimized_posts(manager=Post.objects, filter_published=True,
                         annotate_comments=False):
     """Возвращает оптимизированный кверисет постов
@@ -63,11 +74,7 @@ def get_optimized_posts(manager=Post.objects, filter_published=True,
     queryset = manager.select_related('author', 'category', 'location')
 
     if filter_published:
-        queryset = queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__date__lte=timezone.localtime(timezone.now()),
-        )
+        queryset = queryset.filter(published_posts_filter())
 
     if annotate_comments:
         queryset = queryset.annotate(
@@ -8,7 +8,9 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
 from django.core.mail import send_mail
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.views.generic import (
@@ -19,8 +21,19 @@ from django.views.generic import (
     UpdateView,
 )
 
-from blog.models import Category, Post, User
-from .forms import CommentForm, PostForm, UserForm
+from blog.models import (
+    AuthorStats,
+    Category,
+    CategoryStats,
+    Location,
+    LocationStats,
+    Post,
+    User,
+)
+from .caching import get_directory, get_profile_or_404
+from .forms import CommentForm, NearbyForm, PostForm, UserForm
+from .geo import nearby
+from .streaming import stream_template
 from .utils import (
     CommentMixin,
     OnlyAuthorMixin,
@@ -85,6 +98,28 @@ class PostDetailView(DetailView):
         )
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        """Потоковая отдача страницы при включённом STREAMING_PAGES.
+
+        Под ASGI Django 3.2 перебирает потоковый ответ в цикле событий,
+        где обращаться к ORM нельзя, поэтому там страница рендерится
+        целиком.
+        """
+        if (not settings.STREAMING_PAGES
+                or isinstance(self.request, ASGIRequest)):
+            return super().render_to_response(context, **response_kwargs)
+        return StreamingHttpResponse(stream_template(
+            self.request,
+            'blog/post_detail_stream.html',
+            context,
+            items=context['comments'].iterator(
+                chunk_size=settings.STREAMING_CHUNK_SIZE
+            ),
+            item_template_name='includes/comment_list.html',
+            items_name='comments',
+            chunk_size=settings.STREAMING_CHUNK_SIZE,
+        ))
+
 
 class PostsListView(ListView):
     """Список всех постов."""
@@ -137,8 +172,10 @@ class ProfileDetailView(ListView):
     paginate_by = settings.LIMIT_POSTS
 
     def get_username(self):
-        """Метод возвращает объект User."""
-        return get_object_or_404(User, username=self.kwargs.get('username'))
+        """Метод возвращает объект User (из кэша профилей)."""
+        if not hasattr(self, 'profile'):
+            self.profile = get_profile_or_404(self.kwargs.get('username'))
+        return self.profile
 
     def get_queryset(self):
         """Получаем QuerySet для списка постов"""
@@ -153,6 +190,10 @@ class ProfileDetailView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.get_username()
+        # Готовые счётчики из AuthorStats вместо агрегатов по постам.
+        context['author_stats'] = AuthorStats.objects.filter(
+            pk=context['profile'].pk
+        ).first()
         return context
 
 
@@ -235,3 +276,53 @@ def add_comment(request, post_id):
         comment.post = post
         comment.save()
     return redirect('blog:post_detail', post_id=post_id)
+
+
+class DirectoryView(ListView):
+    """Каталог категорий или местоположений по таблице счётчиков."""
+
+    stats_model = None
+    context_object_name = 'items'
+
+    def get_queryset(self):
+        return get_directory(self.stats_model)
+
+
+class CategoryIndexView(DirectoryView):
+    stats_model = CategoryStats
+    template_name = 'blog/category_index.html'
+
+
+class LocationIndexView(DirectoryView):
+    stats_model = LocationStats
+    template_name = 'blog/location_index.html'
+
+
+class NearbyPostsView(ListView):
+    """Посты из опубликованных местоположений в радиусе от точки."""
+
+    model = Post
+    template_name = 'blog/nearby.html'
+    paginate_by = settings.LIMIT_POSTS
+
+    def get_queryset(self):
+        self.form = NearbyForm(self.request.GET or None)
+        if not self.form.is_valid():
+            return Post.objects.none()
+        point = self.form.cleaned_data
+        locations = nearby(
+            Location.objects.filter(is_published=True),
+            point['latitude'], point['longitude'], point['radius'],
+        )
+        return get_optimized_posts(
+            Post.objects.filter(location__in=locations.values('pk')),
+            annotate_comments=True
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        context['form'] = self.form
+        context['page_query'] = query.urlencode()
+        return context
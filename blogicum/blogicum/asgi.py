@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_WARMUP:
+    from blog.template_loaders import warm_up
+
+    # Первый запрос после деплоя не тратит время на разбор шаблонов.
+    warm_up()
@@ -0,0 +1,23 @@
+"""Настройки проекта.
+
+Общие настройки собраны в ``base``, поверх них применяется профиль из
+переменной окружения DJANGO_ENV: ``development`` (по умолчанию) или
+``production``. DJANGO_SETTINGS_MODULE остаётся ``blogicum.settings``.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ('development', 'production')
+
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'development')
+if DJANGO_ENV not in PROFILES:
+    raise ImproperlyConfigured(
+        f"DJANGO_ENV должна быть одной из: {', '.join(PROFILES)}."
+    )
+
+if DJANGO_ENV == 'production':
+    from .production import *  # noqa: F401,F403
+else:
+    from .development import *  # noqa: F401,F403
@@ -0,0 +1,279 @@
+"""
+Django settings for blogicum project: common base for all profiles.
+
+Generated by 'django-admin startproject' using Django 3.2.16.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/3.2/ref/settings/
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+
+# Профиль настроек: development или production (см. __init__.py).
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'development')
+PRODUCTION: bool = DJANGO_ENV == 'production'
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-_&(h&7ppakvdauz&tsvj40il5i-769+8lcbic3+m@6ho_ftf(g'
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG: bool = os.getenv('DJANGO_DEBUG', '0' if PRODUCTION else '1') == '1'
+
+ALLOWED_HOSTS = os.getenv(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'pages.apps.PagesConfig',
+    'blog.apps.BlogConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'blog.nplusone.NPlusOneMiddleware',
+    'blog.sqlmonitor.ViewContextMiddleware',
+    'blog.compression.CompressionMiddleware',
+    'blog.staticfiles.StaticFilesMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'blog.backends.AuthenticationMiddleware',
+    'blog.profiling.ProfilingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Инструменты разработчика подключает профиль development.
+DEV_TOOLS: bool = False
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Удаление лишних пробелов из HTML-шаблонов при компиляции.
+if os.getenv('TEMPLATE_MINIFY', '1') == '1':
+    TEMPLATE_LOADERS = [
+        ('blog.template_loaders.MinifyingLoader', TEMPLATE_LOADERS)
+    ]
+# Подстановка исходника статических {% include %} при компиляции.
+if os.getenv('TEMPLATE_INLINE_INCLUDES', '1') == '1':
+    TEMPLATE_LOADERS = [
+        ('blog.template_loaders.InliningLoader', TEMPLATE_LOADERS)
+    ]
+# Скомпилированные шаблоны хранятся в памяти процесса; при
+# TEMPLATE_WARMUP они компилируются при запуске (wsgi.py, asgi.py).
+TEMPLATE_CACHE: bool = os.getenv(
+    'TEMPLATE_CACHE', '0' if DEBUG else '1'
+) == '1'
+TEMPLATE_WARMUP: bool = TEMPLATE_CACHE and os.getenv(
+    'TEMPLATE_WARMUP', '1'
+) == '1'
+if TEMPLATE_CACHE:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)
+    ]
+
+# debug_toolbar не видит app_directories.Loader внутри обёрток.
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+
+# Постоянные соединения: DB_CONN_MAX_AGE задаёт время жизни соединения
+# в секундах (0 — новое соединение на каждый запрос, пустое значение —
+# без ограничения). DB_CONN_HEALTH_CHECKS включает проверку соединения
+# перед повторным использованием.
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '0')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'blog.db_backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(DB_CONN_MAX_AGE) if DB_CONN_MAX_AGE else None,
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', '1') == '1',
+    }
+}
+
+# Журнал SQL при DEBUG (blog.querylog): текст запроса не длиннее
+# QUERY_LOG_SQL_LENGTH и сводка по отпечаткам.
+QUERY_LOG_SQL_LENGTH: int = 2000
+QUERY_STATS_LIMIT: int = 500
+# Учёт времени запросов по отпечаткам (blog.sqlmonitor) и журнал
+# запросов дольше SLOW_QUERY_MS с планом EXPLAIN для SELECT.
+SQL_MONITOR: bool = os.getenv('SQL_MONITOR', '1') == '1'
+SLOW_QUERY_MS: float = float(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_EXPLAIN: bool = os.getenv('SLOW_QUERY_EXPLAIN', '1') == '1'
+# Поиск N+1 (blog.nplusone): SELECT одной формы, повторённый
+# NPLUSONE_THRESHOLD раз за запрос; NPLUSONE_RAISE — ошибка вместо лога.
+NPLUSONE_DETECT: bool = os.getenv(
+    'NPLUSONE_DETECT', '1' if DEBUG else '0'
+) == '1'
+NPLUSONE_THRESHOLD: int = int(os.getenv('NPLUSONE_THRESHOLD', '3'))
+NPLUSONE_RAISE: bool = os.getenv('NPLUSONE_RAISE', '0') == '1'
+# Выборочный профилировщик (blog.profiling): доля запросов, префиксы
+# адресов через запятую и частота снятия стеков.
+PROFILING: bool = os.getenv('PROFILING', '0') == '1'
+PROFILE_SAMPLE_RATE: float = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_PATHS: list = [
+    prefix for prefix in os.getenv('PROFILE_PATHS', '').split(',') if prefix
+]
+PROFILE_INTERVAL_MS: float = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+PROFILE_DIR: str = os.getenv(
+    'PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'blogicum-profiles')
+)
+
+
+# Хранилище сессий: db (по умолчанию), cached_db, cache или signed_cookies.
+# Устаревшие сессии в БД удаляются командой cleanup_sessions.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv(
+    'SESSION_BACKEND', 'db'
+)
+
+
+# Пользователь сессии берётся из кэша. Сессии, созданные до включения
+# кэша, переводит на него blog.backends.AuthenticationMiddleware.
+AUTHENTICATION_BACKENDS = [
+    'blog.backends.CachedModelBackend',
+]
+
+
+# Password validation
+# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/3.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/3.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles')
+
+# Хешированные имена и сжатые копии; требует collectstatic.
+if os.getenv('STATIC_MANIFEST', '0') == '1':
+    STATICFILES_STORAGE = (
+        'blog.staticfiles.CompressedManifestStaticFilesStorage'
+    )
+
+# Отдача STATIC_ROOT самим приложением (blog.staticfiles).
+SERVE_STATIC: bool = os.getenv('SERVE_STATIC', '0') == '1'
+
+# Сжатие HTML и других текстовых ответов (blog.compression).
+COMPRESS_RESPONSES: bool = os.getenv('COMPRESS_RESPONSES', '1') == '1'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = '/media/'
+# Загруженные файлы не перезаписываются, поэтому кэшируются надолго.
+MEDIA_CACHE_MAX_AGE: int = 365 * 24 * 60 * 60
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LIMIT_POSTS: int = 10
+# Асинхронные представления ленты для запуска под ASGI-сервером.
+ASYNC_FEED_VIEWS: bool = os.getenv('ASYNC_FEED_VIEWS', '0') == '1'
+# Потоковая отдача страницы поста: комментарии рендерятся порциями.
+STREAMING_PAGES: bool = os.getenv('STREAMING_PAGES', '0') == '1'
+STREAMING_CHUNK_SIZE: int = 50
+# Время жизни кэша пользователей и профилей, секунды.
+USER_CACHE_TIMEOUT: int = 300
+# Время жизни кэша страниц /categories/ и /locations/, секунды.
+DIRECTORY_CACHE_TIMEOUT: int = 300
+# Лента «Публикации рядом»: радиус по умолчанию и наибольший, км.
+NEARBY_RADIUS_KM: float = 10
+NEARBY_MAX_RADIUS_KM: float = 100
+# blog/models
+MAX_LENGTH_TITLE: int = 256
+PRE_TEXT_LEN: int = 15
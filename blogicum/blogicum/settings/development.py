@@ -0,0 +1,18 @@
+"""Профиль разработки: DEBUG и debug_toolbar."""
+
+from .base import *  # noqa: F401,F403
+from .base import DEBUG, INSTALLED_APPS, MIDDLEWARE, os
+
+# Инструменты разработчика (debug_toolbar) вместе с зависимостями
+# добавляют к запуску каждого процесса десятки миллисекунд; DEV_TOOLS=0
+# убирает их из приложений, middleware и URL.
+DEV_TOOLS: bool = os.getenv('DEV_TOOLS', '1' if DEBUG else '0') == '1'
+if DEV_TOOLS:
+    INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+    MIDDLEWARE = [
+        *MIDDLEWARE, 'debug_toolbar.middleware.DebugToolbarMiddleware'
+    ]
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
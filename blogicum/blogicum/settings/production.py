@@ -0,0 +1,99 @@
+"""Профиль продакшена: без отладки и инструментов разработчика.
+
+Все значения можно переопределить переменными окружения. Проверка
+настроек: ``python manage.py check --deploy --tag performance``.
+"""
+
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, os
+
+DEV_TOOLS = False
+
+# Кэш общий для всех воркеров: сигналы сбрасывают ключи пользователей,
+# профилей и каталогов, и сброс должен быть виден каждому процессу.
+# locmem подходит только для одного процесса.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND должна быть одной из: {', '.join(CACHE_BACKENDS)}."
+    )
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            '127.0.0.1:11211' if CACHE_BACKEND == 'memcached'
+            else os.path.join(tempfile.gettempdir(), 'blogicum-cache'),
+        ),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Сессия читается из кэша, а не запросом к БД на каждой странице.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv(
+    'SESSION_BACKEND', 'cached_db'
+)
+
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
+DB_ENGINES = ('sqlite3', 'postgresql')
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+if DB_ENGINE not in DB_ENGINES:
+    raise ImproperlyConfigured(
+        f"DB_ENGINE должна быть одной из: {', '.join(DB_ENGINES)}."
+    )
+if DB_ENGINE == 'postgresql':
+    DATABASE = {
+        'ENGINE': 'blog.db_backends.postgresql',
+        'NAME': os.getenv('DB_NAME', 'blogicum'),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+    }
+else:
+    # WAL: читатели не блокируют писателя; synchronous=NORMAL в режиме
+    # WAL не теряет целостность, но реже вызывает fsync.
+    DATABASE = {
+        'ENGINE': 'blog.db_backends.sqlite3',
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {'timeout': int(os.getenv('DB_TIMEOUT', '20'))},
+        'PRAGMAS': {'journal_mode': 'wal', 'synchronous': 'normal'},
+    }
+DATABASES = {
+    'default': {
+        **DATABASE,
+        'CONN_MAX_AGE': int(DB_CONN_MAX_AGE) if DB_CONN_MAX_AGE else None,
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', '1') == '1',
+    }
+}
+
+# SQL-запросы не логируются: при DEBUG=False Django их и не собирает.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(process)d %(name)s '
+                      '%(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('LOG_LEVEL', 'WARNING'),
+    },
+}
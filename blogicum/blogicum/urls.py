@@ -3,9 +3,11 @@
 """
 
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+from blog.instrumentation import instrumentation_view
+from blog.media import serve_media
+from blog.profiling import profiles_view
 from blog.views import UserCreateView
 
 urlpatterns = [
@@ -14,14 +16,27 @@ urlpatterns = [
     path('pages/', include('pages.urls', namespace='pages')),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', UserCreateView.as_view(), name='registration'),
+    path('instrumentation/', instrumentation_view, name='instrumentation'),
+    path('instrumentation/profiles/', profiles_view, name='profiles'),
+    path(
+        'instrumentation/profiles/<str:view>/',
+        profiles_view,
+        name='profile',
+    ),
 ]
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error_500'
 
-if settings.DEBUG:
+if settings.DEV_TOOLS:
     import debug_toolbar
     # Добавить к списку urlpatterns список адресов из приложения debug_toolbar:
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += (
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$',
+        serve_media,
+        name='media'
+    ),
+)
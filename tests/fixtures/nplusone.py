@@ -0,0 +1,20 @@
+"""Плагин pytest: запрос к странице с N+1 проваливает тест.
+
+Тест, которому повторяющиеся запросы нужны намеренно, помечается
+``@pytest.mark.nplusone_allowed``.
+"""
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "nplusone_allowed: не проверять страницы на N+1"
+    )
+
+
+@pytest.fixture(autouse=True)
+def fail_on_nplusone(request, settings):
+    if request.node.get_closest_marker("nplusone_allowed") is None:
+        settings.NPLUSONE_RAISE = True
+    yield
@@ -0,0 +1,37 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from blog.async_views import AsyncPostDetailView, AsyncPostsListView
+
+
+def _call(view_class, path, **kwargs):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return async_to_sync(view_class.as_view())(request, **kwargs)
+
+
+@pytest.mark.django_db
+def test_async_posts_list(post_with_published_location):
+    response = _call(AsyncPostsListView, "/")
+    assert response.status_code == HTTPStatus.OK
+    assert post_with_published_location.title in response.content.decode(), (
+        "Убедитесь, что асинхронная лента выводит опубликованные посты."
+    )
+
+
+@pytest.mark.django_db
+def test_async_post_detail(comment_to_a_post):
+    post_id = comment_to_a_post.post_id
+    response = _call(
+        AsyncPostDetailView, f"/posts/{post_id}/", post_id=post_id
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert f'name="comment_{comment_to_a_post.id}"' in (
+        response.content.decode()
+    ), (
+        "Убедитесь, что асинхронная страница поста выводит комментарии."
+    )
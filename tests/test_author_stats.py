@@ -0,0 +1,98 @@
+import pytest
+from django.core import serializers
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import AuthorStats, Comment
+from blog.stats import rebuild_author_stats
+
+
+def stats_row(author):
+    stats = AuthorStats.objects.get(pk=author.pk)
+    return (
+        stats.post_count,
+        stats.published_post_count,
+        stats.comment_count,
+        stats.last_post_date,
+    )
+
+
+@pytest.mark.django_db
+def test_author_stats_follow_writes(mixer, user, another_user):
+    first = mixer.blend("blog.Post", author=user, is_published=True)
+    second = mixer.blend("blog.Post", author=user, is_published=False)
+    mixer.blend("blog.Comment", post=first, author=user)
+    comment = mixer.blend("blog.Comment", post=first, author=another_user)
+    stats = AuthorStats.objects.get(pk=user.pk)
+    assert (stats.post_count, stats.published_post_count) == (2, 1), (
+        "Убедитесь, что счётчики постов автора обновляются при создании "
+        "постов."
+    )
+    assert stats.last_post_date == second.created_at
+    second.is_published = True
+    second.save()
+    comment.delete()
+    first.delete()
+    assert stats_row(user)[:3] == (1, 1, 0), (
+        "Убедитесь, что статистика автора обновляется при изменении и "
+        "удалении постов и комментариев."
+    )
+    assert stats_row(another_user)[2] == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental(mixer, user, another_user):
+    posts = mixer.cycle(5).blend("blog.Post", author=user)
+    mixer.cycle(3).blend("blog.Comment", post=posts[0], author=another_user)
+    incremental = [stats_row(user), stats_row(another_user)]
+    AuthorStats.objects.update(post_count=0, comment_count=0)
+    rebuild_author_stats()
+    assert [stats_row(user), stats_row(another_user)] == incremental, (
+        "Убедитесь, что полный пересчёт статистики авторов совпадает "
+        "с инкрементальными обновлениями."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_shows_stats_without_aggregates(mixer, user, client):
+    mixer.cycle(3).blend("blog.Post", author=user, is_published=True)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/profile/{user.username}/")
+    assert "Постов: 3" in response.content.decode(), (
+        "Убедитесь, что на странице профиля выводится статистика автора."
+    )
+    assert not any(
+        "MAX(" in query["sql"] for query in queries.captured_queries
+    ), (
+        "Убедитесь, что статистика профиля берётся из AuthorStats, "
+        "а не считается агрегатами по постам."
+    )
+
+
+@pytest.mark.django_db
+def test_loaddata_does_not_touch_stats(mixer, user):
+    post = mixer.blend("blog.Post", author=user)
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    data = serializers.serialize("json", [comment])
+    Comment.objects.filter(pk=comment.pk).delete()
+    AuthorStats.objects.filter(pk=user.pk).update(comment_count=1)
+    for item in serializers.deserialize("json", data):
+        item.save()
+    assert stats_row(user)[2] == 1, (
+        "Убедитесь, что загрузка фикстур (raw=True) не меняет счётчики."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_backfills_author_stats(mixer, user):
+    mixer.cycle(2).blend("blog.Post", author=user, is_published=True)
+    executor = MigrationExecutor(connection)
+    leaf = executor.loader.graph.leaf_nodes("blog")
+    executor.migrate([("blog", "0001_initial")])
+    executor = MigrationExecutor(connection)
+    executor.migrate(leaf)
+    assert stats_row(user)[:3] == (2, 2, 0), (
+        "Убедитесь, что миграция заполняет статистику существующих "
+        "авторов."
+    )
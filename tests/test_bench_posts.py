@@ -0,0 +1,45 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.management.commands import bench_posts
+
+
+@pytest.mark.django_db
+def test_bench_posts_reports_cases_with_plans(
+        tmp_path, posts_with_unpublished_category):
+    output = tmp_path / "baseline.json"
+    call_command(
+        "bench_posts", current=True, repeat=2, output=str(output),
+        stdout=io.StringIO(),
+    )
+    report = json.loads(output.read_text())
+    cases = report["datasets"]["current"]["cases"]
+    assert set(cases) == set(bench_posts.CASES)
+    for case in cases.values():
+        assert case["page"]["count"] == 2 and "p50_ms" in case["count"]
+        assert "blog_post" in case["plans"]["count"], (
+            "Убедитесь, что для каждого варианта сохраняется план EXPLAIN."
+        )
+
+
+@pytest.mark.django_db
+def test_bench_posts_fails_on_regression(
+        tmp_path, monkeypatch, posts_with_unpublished_category):
+    monkeypatch.setattr(bench_posts, "NOISE_MS", 0)
+    baseline = tmp_path / "baseline.json"
+    call_command(
+        "bench_posts", current=True, repeat=2, output=str(baseline),
+        stdout=io.StringIO(),
+    )
+    report = json.loads(baseline.read_text())
+    report["datasets"]["current"]["cases"]["all"]["page"]["p50_ms"] = 1e-6
+    baseline.write_text(json.dumps(report))
+    with pytest.raises(CommandError, match="current/all/page"):
+        call_command(
+            "bench_posts", current=True, repeat=2,
+            compare=str(baseline), stdout=io.StringIO(),
+        )
@@ -0,0 +1,64 @@
+import gzip
+
+import pytest
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from blog.compression import CompressionMiddleware
+from blog.template_loaders import minify
+
+
+def test_minify_keeps_visible_text():
+    source = (
+        "<ul>\n  {% for item in items %}\n    <li>{{ item }}  и  ещё</li>\n"
+        "  {% endfor %}\n</ul>\n"
+    )
+    assert minify(source) == (
+        "<ul>\n{% for item in items %}<li>{{ item }} и ещё</li>\n"
+        "{% endfor %}</ul>\n"
+    ), "Убедитесь, что из шаблонов удаляются отступы и пустые строки."
+    preformatted = "<pre>\n  код\n</pre>"
+    assert minify(preformatted) == preformatted
+
+
+def test_reset_email_is_not_minified(settings):
+    assert any(
+        "MinifyingLoader" in str(loader)
+        for loader in settings.TEMPLATES[0]["OPTIONS"]["loaders"]
+    )
+    email = render_to_string("registration/password_reset_email.html", {
+        "protocol": "http", "domain": "example.com", "uid": "MQ",
+        "token": "set-password", "site_name": "Блогикум",
+    })
+    assert "\nhttp://example.com/auth/reset/MQ/set-password/\n" in email, (
+        "Убедитесь, что текстовые шаблоны писем не минифицируются."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_is_minified_and_gzipped(client, post_with_published_location):
+    plain = client.get("/")
+    assert "\n  " not in plain.content.decode(), (
+        "Убедитесь, что HTML ленты выводится без отступов."
+    )
+    compressed = client.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert compressed["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed["Vary"]
+    assert gzip.decompress(compressed.content) == plain.content, (
+        "Убедитесь, что ответ сжимается gzip без изменения содержимого."
+    )
+
+
+def test_streaming_response_compressed_per_chunk():
+    chunks = [b"<p>" + b"x" * 300 + b"</p>", b"<p>tail</p>"]
+    middleware = CompressionMiddleware(
+        lambda request: StreamingHttpResponse(iter(chunks))
+    )
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+    parts = list(middleware(request).streaming_content)
+    assert len(parts) > len(chunks), (
+        "Убедитесь, что потоковый ответ сжимается порциями, "
+        "а не буферизуется целиком."
+    )
+    assert gzip.decompress(b"".join(parts)) == b"".join(chunks)
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from blog.db_backends import connection_stats
+
+
+@pytest.mark.django_db(transaction=True)
+def test_health_check_on_reused_connection(monkeypatch):
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", None)
+    monkeypatch.setitem(connection.settings_dict, "CONN_HEALTH_CHECKS", True)
+    connection.ensure_connection()
+    connection_stats.reset()
+
+    connection.close_if_unusable_or_obsolete()
+    connection.ensure_connection()
+    stats = connection_stats.snapshot()["aliases"][connection.alias]
+    assert stats["connections_reused"] == 1, (
+        "Убедитесь, что постоянное соединение переиспользуется "
+        "и учитывается в статистике."
+    )
+
+    monkeypatch.setattr(connection, "is_usable", lambda: False)
+    connection.close_if_unusable_or_obsolete()
+    connection.ensure_connection()
+    stats = connection_stats.snapshot()["aliases"][connection.alias]
+    assert stats["health_check_failures"] == 1, (
+        "Убедитесь, что перед повторным использованием соединение "
+        "проверяется и неработающее соединение закрывается."
+    )
+
+
+@pytest.mark.django_db
+def test_instrumentation_endpoint(client, user_client, mixer):
+    response = client.get("/instrumentation/")
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что эндпоинт инструментирования недоступен анонимам."
+    )
+    admin = mixer.blend("auth.User", is_staff=True, is_active=True)
+    client.force_login(admin)
+    response = client.get("/instrumentation/")
+    assert response.status_code == HTTPStatus.OK
+    assert "db_connections" in response.json(), (
+        "Убедитесь, что статистика соединений отдаётся эндпоинтом "
+        "инструментирования."
+    )
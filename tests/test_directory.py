@@ -0,0 +1,160 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import CategoryStats, LocationStats
+from blog.stats import rebuild_directory_stats
+
+
+def directory(stats_model):
+    return {
+        row.pk: (row.published_post_count, row.latest_post_id)
+        for row in stats_model.objects.all()
+    }
+
+
+@pytest.mark.django_db
+def test_directory_stats_follow_writes(
+        mixer, user, published_category, published_location):
+    now = timezone.now()
+    older, newer = (
+        mixer.blend(
+            "blog.Post", author=user, is_published=True,
+            category=published_category, location=published_location,
+            pub_date=now - timezone.timedelta(days=days),
+        )
+        for days in (2, 1)
+    )
+    mixer.blend(
+        "blog.Post", author=user, is_published=True,
+        category=published_category, pub_date=now + timezone.timedelta(days=1),
+    )
+    stats = CategoryStats.objects.get(pk=published_category.pk)
+    assert (stats.published_post_count, stats.latest_post_id) == (
+        2, newer.pk
+    ), (
+        "Убедитесь, что счётчик категории учитывает только видимые в ленте "
+        "посты и хранит последний из них."
+    )
+    newer.is_published = False
+    newer.save()
+    assert directory(LocationStats)[published_location.pk] == (1, older.pk)
+    older.delete()
+    assert directory(CategoryStats)[published_category.pk] == (0, None), (
+        "Убедитесь, что счётчики каталогов обновляются при изменении и "
+        "удалении постов."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_directory_matches_incremental(
+        mixer, user, published_category, published_location):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, is_published=True,
+        category=published_category, location=published_location,
+        pub_date=timezone.now() - timezone.timedelta(hours=1),
+    )
+    incremental = directory(CategoryStats), directory(LocationStats)
+    CategoryStats.objects.all().delete()
+    rebuild_directory_stats()
+    assert (directory(CategoryStats), directory(LocationStats)) == (
+        incremental
+    ), (
+        "Убедитесь, что полный пересчёт каталогов совпадает "
+        "с инкрементальными обновлениями."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/categories/", "/locations/"])
+def test_directory_page_single_cached_query(
+        url, client, post_with_published_location):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert sum(
+        "stats" in query["sql"] for query in queries.captured_queries
+    ) == 1, f"Убедитесь, что страница `{url}` строится одним запросом."
+    assert post_with_published_location.title in response.content.decode(), (
+        f"Убедитесь, что на странице `{url}` выводится последний пост."
+    )
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert not any(
+        "stats" in query["sql"] for query in queries.captured_queries
+    ), (
+        f"Убедитесь, что страница `{url}` кэшируется и повторно "
+        "не обращается к таблице счётчиков."
+    )
+
+
+@pytest.mark.django_db
+def test_post_write_shifts_counters_without_count(
+        mixer, user, published_category, published_location):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", author=user, is_published=True,
+        category=published_category, location=published_location,
+        pub_date=(
+            timezone.now() - timezone.timedelta(days=days)
+            for days in (2, 1)
+        ),
+    )
+    with CaptureQueriesContext(connection) as queries:
+        posts[0].is_published = False
+        posts[0].save()
+        posts[1].delete()
+    assert not any(
+        "COUNT(" in query["sql"] and (
+            'FROM "blog_category"' in query["sql"]
+            or 'FROM "blog_location"' in query["sql"]
+        )
+        for query in queries.captured_queries
+    ), (
+        "Убедитесь, что запись поста сдвигает счётчики каталогов, "
+        "а не пересчитывает их."
+    )
+    assert directory(CategoryStats)[published_category.pk] == (0, None)
+    posts[0].is_published = True
+    posts[0].save()
+    assert directory(LocationStats)[published_location.pk] == (
+        1, posts[0].pk
+    )
+
+
+@pytest.mark.django_db
+def test_deleting_latest_post_picks_previous(
+        mixer, user, published_category):
+    older, newer = mixer.cycle(2).blend(
+        "blog.Post", author=user, is_published=True,
+        category=published_category,
+        pub_date=(
+            timezone.now() - timezone.timedelta(days=days)
+            for days in (2, 1)
+        ),
+    )
+    newer.delete()
+    assert directory(CategoryStats)[published_category.pk] == (
+        1, older.pk
+    ), "Убедитесь, что после удаления последнего поста показан предыдущий."
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_backfills_directory_stats(
+        mixer, user, published_category, published_location):
+    post = mixer.blend(
+        "blog.Post", author=user, is_published=True,
+        category=published_category, location=published_location,
+        pub_date=timezone.now() - timezone.timedelta(hours=1),
+    )
+    executor = MigrationExecutor(connection)
+    leaf = executor.loader.graph.leaf_nodes("blog")
+    executor.migrate([("blog", "0002_author_stats")])
+    executor = MigrationExecutor(connection)
+    executor.migrate(leaf)
+    assert directory(CategoryStats)[published_category.pk] == (1, post.pk)
+    assert directory(LocationStats)[published_location.pk] == (1, post.pk), (
+        "Убедитесь, что миграция заполняет каталоги существующих "
+        "категорий и местоположений."
+    )
@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from blog.dumps import iter_json_objects
+
+OBJECTS = [
+    {"model": "blog.location", "pk": i, "fields": {"name": f"Место {i}"}}
+    for i in range(1, 6)
+]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        json.dumps(OBJECTS, indent=2, ensure_ascii=False),
+        "\n".join(json.dumps(obj, ensure_ascii=False) for obj in OBJECTS),
+    ],
+    ids=["json-array", "ndjson"],
+)
+def test_iter_json_objects(content):
+    parsed = list(iter_json_objects(io.StringIO(content), read_size=7))
+    assert parsed == OBJECTS, (
+        "Убедитесь, что потоковый разбор дампа возвращает все объекты "
+        "независимо от размера читаемого куска."
+    )
+
+
+@pytest.mark.django_db
+def test_importdump_bulk_loads_objects(tmp_path):
+    from blog.models import Location
+
+    dump = tmp_path / "dump.json"
+    created_at = "2022-12-18T23:03:52.159Z"
+    dump.write_text(json.dumps([
+        {**obj, "fields": {**obj["fields"], "is_published": True,
+                           "created_at": created_at}}
+        for obj in OBJECTS
+    ]), encoding="utf-8")
+    call_command("importdump", str(dump), batch_size=2, stdout=io.StringIO())
+    assert Location.objects.count() == len(OBJECTS), (
+        "Убедитесь, что команда importdump загружает все объекты дампа."
+    )
+    assert Location.objects.get(pk=1).created_at.year == 2022, (
+        "Убедитесь, что команда importdump сохраняет даты из дампа."
+    )
+
+
+@pytest.mark.django_db
+def test_export_roundtrip(tmp_path, mixer):
+    from blog.models import Category
+
+    categories = mixer.cycle(3).blend("blog.Category")
+    call_command(
+        "export", "categories", output_dir=str(tmp_path), gzip=True,
+        stdout=io.StringIO(),
+    )
+    Category.objects.all().delete()
+    call_command(
+        "importdump", str(tmp_path / "categories.ndjson.gz"),
+        stdout=io.StringIO(),
+    )
+    assert set(Category.objects.values_list("slug", flat=True)) == {
+        category.slug for category in categories
+    }, (
+        "Убедитесь, что выгрузка export в NDJSON загружается обратно "
+        "командой importdump."
+    )
@@ -0,0 +1,44 @@
+import pytest
+from django.template import Context, Template
+from django.urls import reverse, set_script_prefix
+
+from blog.fast_urls import fast_url
+
+
+@pytest.mark.parametrize("name, args", [
+    ("blog:index", ()),
+    ("blog:post_detail", (42,)),
+    ("blog:profile", ("Пользователь+1@x",)),
+    ("blog:category_posts", ("travel-2",)),
+    ("blog:edit_post", (7,)),
+])
+def test_fast_url_matches_reverse(name, args):
+    assert fast_url(name, *args) == reverse(name, args=args), (
+        "Убедитесь, что fast_url строит те же адреса, что и reverse()."
+    )
+
+
+def test_fast_url_respects_script_prefix():
+    set_script_prefix("/blog/")
+    try:
+        assert fast_url("blog:post_detail", 1) == "/blog/posts/1/", (
+            "Убедитесь, что fast_url учитывает префикс скрипта."
+        )
+    finally:
+        set_script_prefix("/")
+
+
+@pytest.mark.django_db
+def test_fast_url_tag_and_model_urls(post_with_published_location):
+    post = post_with_published_location
+    html = Template(
+        "{% load blog_urls %}"
+        "{% fast_url 'blog:profile' post.author.username %}"
+    ).render(Context({"post": post}))
+    assert html == post.author_url == reverse(
+        "blog:profile", args=[post.author.username]
+    ), "Убедитесь, что тег fast_url и Post.author_url дают адрес профиля."
+    assert post.get_absolute_url() == post.url == f"/posts/{post.id}/"
+    assert post.category.url == reverse(
+        "blog:category_posts", args=[post.category.slug]
+    )
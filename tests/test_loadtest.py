@@ -0,0 +1,18 @@
+import pytest
+
+from blog.loadtest import AnonymousBrowsing, Commenting, ScenarioRunner
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("scenario", [AnonymousBrowsing, Commenting])
+def test_loadtest_scenarios(scenario, comment_to_a_post):
+    report = ScenarioRunner(
+        scenario(), "client", requests=3, concurrency=2, seed=1
+    ).run()
+    assert report["requests"] > 0 and report["error_rate"] == 0, (
+        f"Убедитесь, что сценарий {scenario.name} выполняется без ошибок."
+    )
+    for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+        assert key in report or key in report["latency"], (
+            f"Убедитесь, что отчёт нагрузочного теста содержит `{key}`."
+        )
@@ -0,0 +1,52 @@
+import pytest
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "post_images").mkdir()
+    data = bytes(range(256)) * 64
+    (tmp_path / "post_images" / "photo.jpg").write_bytes(data)
+    return data
+
+
+@pytest.mark.django_db
+def test_media_full_and_conditional(client, media_file):
+    response = client.get("/media/post_images/photo.jpg")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == media_file
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что загруженные файлы отдаются с долгим кэшированием."
+    )
+    assert response["Content-Type"] == "image/jpeg"
+    cached = client.get(
+        "/media/post_images/photo.jpg", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert cached.status_code == 304, (
+        "Убедитесь, что при совпадении ETag возвращается 304."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", slice(0, 10)),
+    ("bytes=100-", slice(100, None)),
+    ("bytes=-16", slice(-16, None)),
+])
+def test_media_range(client, media_file, header, expected):
+    response = client.get("/media/post_images/photo.jpg", HTTP_RANGE=header)
+    body = b"".join(response.streaming_content)
+    assert response.status_code == 206 and body == media_file[expected], (
+        "Убедитесь, что запрос диапазона отдаёт только запрошенные байты."
+    )
+    assert response["Content-Length"] == str(len(body))
+
+
+@pytest.mark.django_db
+def test_media_errors(client, media_file):
+    unsatisfiable = client.get(
+        "/media/post_images/photo.jpg", HTTP_RANGE="bytes=99999-"
+    )
+    assert unsatisfiable.status_code == 416
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/post_images/missing.jpg").status_code == 404
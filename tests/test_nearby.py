@@ -0,0 +1,76 @@
+import random
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.geo import bounding_box, cell_ranges, distance_km, grid_cell
+from blog.models import Location
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude", [(55.75, 37.62), (10.0, 179.95), (-89.9, 0.0)]
+)
+def test_grid_cells_cover_radius(latitude, longitude):
+    rng = random.Random(0)
+    cells = cell_ranges(bounding_box(latitude, longitude, 50))
+    checked = 0
+    while checked < 200:
+        lat = latitude + rng.uniform(-1, 1)
+        lon = (longitude + rng.uniform(-3, 3) + 180) % 360 - 180
+        if abs(lat) > 90 or distance_km(latitude, longitude, lat, lon) > 50:
+            continue
+        checked += 1
+        cell = grid_cell(lat, lon)
+        assert any(first <= cell <= last for first, last in cells), (
+            "Убедитесь, что ячейки сетки покрывают весь круг поиска, "
+            "в том числе у полюсов и 180-го меридиана."
+        )
+
+
+@pytest.mark.django_db
+def test_nearby_feed(mixer, user, published_category, client):
+    near = mixer.blend(
+        "blog.Location", is_published=True, latitude=55.75, longitude=37.62
+    )
+    far = mixer.blend(
+        "blog.Location", is_published=True, latitude=59.94, longitude=30.31
+    )
+    posts = {
+        location.pk: mixer.blend(
+            "blog.Post", author=user, is_published=True,
+            category=published_category, location=location,
+            pub_date=timezone.now() - timezone.timedelta(hours=1),
+        )
+        for location in (near, far)
+    }
+    assert near.grid_cell == grid_cell(55.75, 37.62)
+    response = client.get(
+        "/near/", {"latitude": 55.7, "longitude": 37.5, "radius": 20}
+    )
+    page = list(response.context["page_obj"])
+    assert page == [posts[near.pk]], (
+        "Убедитесь, что лента `/near/` выводит только посты из "
+        "местоположений в заданном радиусе."
+    )
+    sql = str(response.context["paginator"].object_list.query)
+    assert '"location_id" IN (SELECT' in sql, (
+        "Убедитесь, что местоположения передаются подзапросом, "
+        "а не списком id."
+    )
+    response = client.get("/near/", {"location": far.pk})
+    assert list(response.context["page_obj"]) == [posts[far.pk]]
+
+
+@pytest.mark.django_db
+def test_grid_cell_is_indexed():
+    box = bounding_box(55.75, 37.62, 20)
+    first, last = cell_ranges(box)[0]
+    query = Location.objects.filter(grid_cell__range=(first, last))
+    sql, params = query.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(str(row) for row in cursor.fetchall())
+    assert "grid_cell" in plan and "INDEX" in plan.upper(), (
+        "Убедитесь, что поиск по ячейкам сетки использует индекс."
+    )
@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.test import RequestFactory
+
+from blog.models import Post
+from blog.nplusone import NPlusOneError, NPlusOneMiddleware, detect_nplusone
+
+CARDS = engines["django"].from_string(
+    "{% for post in posts %}\n{{ post.author.username }}\n{% endfor %}"
+)
+
+
+def render_cards(request):
+    posts = Post.objects.order_by("pk")
+    return HttpResponse(CARDS.render({"posts": posts}))
+
+
+def stream_cards(request):
+    def cards():
+        for post in Post.objects.order_by("pk"):
+            yield CARDS.render({"posts": [post]})
+
+    return StreamingHttpResponse(cards())
+
+
+@pytest.mark.django_db
+def test_repeated_queries_point_to_template_line(
+        posts_with_unpublished_category):
+    with detect_nplusone() as counter:
+        CARDS.render({"posts": Post.objects.all()})
+    [(key, count, origin)] = counter.repeated()
+    assert count == len(posts_with_unpublished_category)
+    assert '"auth_user"' in key
+    assert origin.endswith(":2 {{ post.author.username }}"), (
+        "Убедитесь, что для N+1 указывается строка шаблона."
+    )
+
+
+@pytest.mark.django_db
+def test_select_related_is_not_reported(posts_with_unpublished_category):
+    with detect_nplusone() as counter:
+        CARDS.render({"posts": Post.objects.select_related("author")})
+    assert counter.repeated() == []
+
+
+@pytest.mark.django_db
+def test_middleware_fails_tests_on_nplusone(posts_with_unpublished_category):
+    middleware = NPlusOneMiddleware(render_cards)
+    with pytest.raises(NPlusOneError, match="post.author.username"):
+        middleware(RequestFactory().get("/"))
+
+
+@pytest.mark.nplusone_allowed
+@pytest.mark.django_db
+def test_allowed_nplusone_is_logged(caplog, posts_with_unpublished_category):
+    middleware = NPlusOneMiddleware(render_cards)
+    with caplog.at_level(logging.WARNING, logger="blog.nplusone"):
+        response = middleware(RequestFactory().get("/"))
+    assert response.status_code == 200
+    assert "N+1 на /" in caplog.text, (
+        "Убедитесь, что без NPLUSONE_RAISE N+1 пишется в лог."
+    )
+
+
+@pytest.mark.django_db
+def test_nplusone_detected_while_streaming(posts_with_unpublished_category):
+    middleware = NPlusOneMiddleware(stream_cards)
+    response = middleware(RequestFactory().get("/"))
+    with pytest.raises(NPlusOneError, match="post.author.username"):
+        b"".join(response.streaming_content)
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.checks import run_checks
+
+PRODUCTION_SCRIPT = """
+import json
+import django
+django.setup()
+from django.conf import settings
+from django.core.checks import run_checks
+from django.db import connection
+with connection.cursor() as cursor:
+    cursor.execute('PRAGMA journal_mode')
+    journal_mode = cursor.fetchone()[0]
+print(json.dumps({
+    'debug': settings.DEBUG,
+    'debug_toolbar': 'debug_toolbar' in settings.INSTALLED_APPS,
+    'journal_mode': journal_mode,
+    'issues': [
+        error.id for error in run_checks(
+            include_deployment_checks=True, tags=['performance']
+        )
+    ],
+}))
+"""
+
+
+def performance_issues():
+    return {
+        error.id for error in run_checks(
+            include_deployment_checks=True, tags=["performance"]
+        )
+    }
+
+
+def test_development_settings_are_reported(settings):
+    settings.DEBUG = True
+    assert {"blog.W001", "blog.W003", "blog.W004", "blog.W007"} <= (
+        performance_issues()
+    ), "Убедитесь, что проверки performance находят настройки разработки."
+    settings.DEBUG = False
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    assert not {"blog.W001", "blog.W007"} & performance_issues()
+
+
+def test_production_profile(tmp_path):
+    process = subprocess.run(
+        [sys.executable, "-c", PRODUCTION_SCRIPT],
+        cwd="blogicum", capture_output=True, text=True, check=True,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+            "DJANGO_ENV": "production",
+            "DB_NAME": str(tmp_path / "db.sqlite3"),
+            "CACHE_LOCATION": str(tmp_path / "cache"),
+        },
+    )
+    result = json.loads(process.stdout)
+    assert result == {
+        "debug": False,
+        "debug_toolbar": False,
+        "journal_mode": "wal",
+        "issues": [],
+    }, "Убедитесь, что профиль production не вызывает предупреждений."
+
+
+@pytest.mark.parametrize("name, value", [
+    ("CACHE_BACKEND", "redis"),
+    ("DB_ENGINE", "postgres"),
+])
+def test_unknown_backend_is_rejected(name, value):
+    process = subprocess.run(
+        [sys.executable, "-c", "import django; django.setup()"],
+        cwd="blogicum", capture_output=True, text=True,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+            "DJANGO_ENV": "production",
+            name: value,
+        },
+    )
+    assert process.returncode != 0
+    assert f"ImproperlyConfigured: {name}" in process.stderr, (
+        f"Убедитесь, что неизвестный {name} вызывает "
+        "ImproperlyConfigured со списком допустимых значений."
+    )
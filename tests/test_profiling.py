@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.profiling import ProfilingMiddleware
+
+
+def busy_view(request):
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return HttpResponse()
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    settings.PROFILING = True
+    settings.PROFILE_DIR = str(tmp_path)
+    settings.PROFILE_INTERVAL_MS = 1
+    return tmp_path
+
+
+def test_profiling_is_off_by_default():
+    with pytest.raises(MiddlewareNotUsed):
+        ProfilingMiddleware(busy_view)
+
+
+def test_sampled_request_writes_collapsed_stacks(profiling, settings):
+    settings.PROFILE_PATHS = ["/slow/"]
+    middleware = ProfilingMiddleware(busy_view)
+    middleware(RequestFactory().get("/fast/"))
+    assert not list(profiling.iterdir()), (
+        "Убедитесь, что запросы вне PROFILE_PATHS не профилируются."
+    )
+    middleware(RequestFactory().get("/slow/"))
+    lines = (profiling / "unresolved.collapsed").read_text().splitlines()
+    assert lines
+    assert all(
+        line.startswith("blog.profiling:__call__;") for line in lines
+    ), "Убедитесь, что стеки начинаются с кадра профилировщика."
+    assert any("test_profiling:busy_view" in line for line in lines)
+
+
+@pytest.mark.django_db
+def test_staff_requests_profile_and_read_it(
+        profiling, admin_client, client):
+    response = admin_client.get("/?profile=1")
+    assert response.status_code == 200
+    assert (profiling / "blog.index.collapsed").exists()
+    profiles = admin_client.get("/instrumentation/profiles/").json()
+    assert profiles["blog.index"] > 0
+    flame = admin_client.get("/instrumentation/profiles/blog.index/")
+    assert flame.content.startswith(b"blog.profiling:__call__;"), (
+        "Убедитесь, что профиль представления отдаётся сотрудникам."
+    )
+    assert client.get("/instrumentation/profiles/").status_code == 302
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.querylog import QueryLog, QueryStats, fingerprint, get_stats
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint(
+        "SELECT * FROM t WHERE id IN (1, 2, 3) AND title = 'a''b'"
+    ) == fingerprint(
+        "SELECT *  FROM t\nWHERE id IN (%s) AND title = %s"
+    ) == "SELECT * FROM t WHERE id IN (...) AND title = ?"
+    assert fingerprint(
+        "INSERT INTO t VALUES (1, 'x', NULL), (2, 'y', 3)"
+    ) == "INSERT INTO t VALUES (...), ...", (
+        "Убедитесь, что строки VALUES любой длины дают один отпечаток."
+    )
+    assert fingerprint(
+        "INSERT INTO t (a, b) SELECT 1, 'x' UNION ALL SELECT 2, NULL"
+    ) == "INSERT INTO t (a, b) SELECT ... UNION ALL ..."
+    assert fingerprint('SELECT "T3"."id" FROM "blog_post" T3') == (
+        'SELECT "T3"."id" FROM "blog_post" T3'
+    )
+
+
+def test_query_log_is_bounded(settings):
+    settings.QUERY_LOG_SQL_LENGTH = 10
+    log = QueryLog(3)
+    for number in range(5):
+        log.append({"sql": f"SELECT {number} FROM blog_post", "time": "0.002"})
+    assert len(log) == 3 and log[0]["sql"].startswith("SELECT 2 F..."), (
+        "Убедитесь, что журнал хранит последние запросы с обрезанным SQL."
+    )
+
+
+def test_query_stats_by_fingerprint():
+    stats = QueryStats()
+    for number, duration in enumerate((0.002, 0.004, 0.008)):
+        stats.add(f"SELECT {number} FROM blog_post", duration)
+    stats.set_plan("SELECT ? FROM blog_post", "SCAN blog_post")
+    assert stats.top() == [{
+        "fingerprint": "SELECT ? FROM blog_post",
+        "count": 3,
+        "total_ms": 14.0,
+        "max_ms": 8.0,
+        "plan": "SCAN blog_post",
+    }], "Убедитесь, что время запросов копится по отпечаткам."
+
+
+@pytest.mark.django_db
+def test_connection_uses_query_log(settings):
+    settings.DEBUG = True
+    connection.queries_log.clear()
+    get_stats("default").reset()
+    list(Post.objects.filter(pk__in=[1, 2]))
+    assert isinstance(connection.queries_log, QueryLog)
+    assert len(connection.queries) == 1
+    assert any(
+        'WHERE "blog_post"."id" IN (...)' in row["fingerprint"]
+        for row in get_stats("default").top()
+    )
+
+
+@pytest.mark.django_db
+def test_capture_queries_sees_queries_after_long_run():
+    connection.queries_log.clear()
+    for _ in range(600):
+        Post.objects.exists()
+    with CaptureQueriesContext(connection) as queries:
+        Post.objects.exists()
+        Post.objects.count()
+    assert len(queries) == 2, (
+        "Убедитесь, что журнал не меньше журнала Django и "
+        "CaptureQueriesContext видит новые запросы."
+    )
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from blog.management.commands.seed import generate_comments, generate_posts
+
+
+def test_seed_generation_is_deterministic():
+    params = {
+        "first_id": 1, "days": 30, "future_ratio": 0.1,
+        "unpublished_ratio": 0.1, "image_ratio": 0.5,
+        "users": 5, "categories": 3, "locations": 2,
+    }
+    assert generate_posts((1, 0, 20, params)) == generate_posts(
+        (1, 0, 20, params)
+    ), "Убедитесь, что посты генерируются детерминированно по seed."
+    comment_params = {"posts": 20, "users": 5, "zipf": 1.1}
+    assert generate_comments((1, 0, 50, comment_params)) == (
+        generate_comments((1, 0, 50, comment_params))
+    ), "Убедитесь, что комментарии генерируются детерминированно по seed."
+
+
+@pytest.mark.django_db
+def test_seed_command_creates_objects():
+    from blog.models import Comment, Post
+
+    call_command(
+        "seed", users=3, categories=2, locations=2, posts=30, comments=100,
+        image_ratio=0, future_ratio=0.5, batch_size=7, stdout=io.StringIO(),
+    )
+    assert Post.objects.count() == 30 and Comment.objects.count() == 100, (
+        "Убедитесь, что команда seed создаёт заданное число постов "
+        "и комментариев."
+    )
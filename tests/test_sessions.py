@@ -0,0 +1,46 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_cleanup_sessions_in_batches():
+    now = timezone.now()
+    for number in range(5):
+        Session.objects.create(
+            session_key=f"expired{number}", session_data="",
+            expire_date=now - timedelta(days=1),
+        )
+    Session.objects.create(
+        session_key="alive", session_data="",
+        expire_date=now + timedelta(days=1),
+    )
+    call_command("cleanup_sessions", batch_size=2, pause=0,
+                 stdout=io.StringIO())
+    assert list(Session.objects.values_list("pk", flat=True)) == ["alive"], (
+        "Убедитесь, что команда cleanup_sessions удаляет все устаревшие "
+        "сессии и не трогает действующие."
+    )
+
+
+@pytest.mark.django_db
+def test_session_stats_growth_covers_last_days(settings):
+    now = timezone.now()
+    age = timedelta(seconds=settings.SESSION_COOKIE_AGE)
+    for number, days_ago in enumerate((1, 2, 2, 5, 20)):
+        Session.objects.create(
+            session_key=f"written{number}", session_data="",
+            expire_date=now - timedelta(days_ago) + age,
+        )
+    stdout = io.StringIO()
+    call_command("session_stats", days=3, iterations=1, stdout=stdout)
+    growth = json.loads(stdout.getvalue())["table"]["written_per_day"]
+    assert sorted(growth.values()) == [1, 2], (
+        "Убедитесь, что рост таблицы сессий считается за последние "
+        "--days дней записи, а не со сдвигом на SESSION_COOKIE_AGE."
+    )
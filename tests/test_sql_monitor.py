@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+from django.db import connection
+
+from blog.querylog import get_stats
+from blog.sqlmonitor import QueryMonitor
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = next(
+        wrapper for wrapper in connection.execute_wrappers
+        if isinstance(wrapper, QueryMonitor)
+    )
+    monkeypatch.setattr(monitor, "threshold", 0)
+    get_stats("default").reset()
+    return monitor
+
+
+@pytest.mark.django_db
+def test_slow_queries_are_logged_with_view_and_plan(
+        client, caplog, monitor, post_with_published_location):
+    with caplog.at_level(logging.WARNING, logger="blog.sql"):
+        client.get("/")
+    messages = [record.getMessage() for record in caplog.records]
+    feed = [
+        message for message in messages
+        if "blog.views.PostsListView" in message
+        and '"blog_post"' in message
+    ]
+    assert feed, (
+        "Убедитесь, что медленные запросы пишутся в лог blog.sql "
+        "с представлением."
+    )
+    assert any("\n    SCAN blog_post" in message for message in feed), (
+        "Убедитесь, что для медленного SELECT выводится план "
+        "EXPLAIN QUERY PLAN."
+    )
+    assert any("plan" in row for row in get_stats("default").top(100))
+
+
+@pytest.mark.django_db
+def test_queries_are_counted_without_debug(settings, monitor):
+    settings.DEBUG = False
+    for _ in range(3):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT %s", [1])
+    row = next(
+        row for row in get_stats("default").top(100)
+        if row["fingerprint"] == "SELECT ?"
+    )
+    assert row["count"] == 3, (
+        "Убедитесь, что запросы учитываются по отпечаткам и без DEBUG."
+    )
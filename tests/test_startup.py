@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from blog.startup import aggregate, measure_startup, parse_importtime
+
+# Бюджет холодного запуска воркера профиля production, мс: интерпретатор,
+# Django, модуль приложения, URLconf и прогрев шаблонов. Измерено около
+# 450 мс; запас — на медленные машины.
+COLD_START_BUDGET_MS = 1500
+# Замеры времени зависят от нагрузки на машину и запускаются отдельно.
+benchmark = pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1",
+    reason="замер времени; запуск с RUN_BENCHMARKS=1",
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils
+import time:       300 |        400 |   django.db
+import time:        50 |        450 | django
+import time:       200 |        200 | blog.views
+"""
+
+
+def test_parse_and_aggregate_importtime():
+    rows = parse_importtime(IMPORTTIME_OUTPUT)
+    assert rows[0] == ("django.utils", 100, 100, 2)
+    assert aggregate(rows) == [("django", 0.45, 3), ("blog", 0.2, 1)], (
+        "Убедитесь, что время импорта суммируется по пакетам."
+    )
+
+
+def production_startup(tmp_path):
+    return measure_startup(env={
+        "DJANGO_ENV": "production",
+        "DB_NAME": str(tmp_path / "db.sqlite3"),
+        "CACHE_LOCATION": str(tmp_path / "cache"),
+    })
+
+
+def test_production_start_skips_dev_tools(tmp_path):
+    modules = {row[0] for row in production_startup(tmp_path)["modules"]}
+    assert "debug_toolbar" not in modules and "django.test" not in modules, (
+        "Убедитесь, что профиль production не импортирует debug_toolbar."
+    )
+    assert "blog.views" in modules
+
+
+@benchmark
+def test_production_cold_start_within_budget(tmp_path):
+    result = production_startup(tmp_path)
+    assert result["wall_ms"] < COLD_START_BUDGET_MS, (
+        f"Холодный запуск занял {result['wall_ms']} мс — больше бюджета "
+        f"{COLD_START_BUDGET_MS} мс."
+    )
@@ -0,0 +1,53 @@
+import gzip
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+
+from blog.staticfiles import StaticFilesMiddleware
+
+
+@pytest.fixture
+def collected_static(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = (
+        "blog.staticfiles.CompressedManifestStaticFilesStorage"
+    )
+    settings.SERVE_STATIC = True
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+def test_collectstatic_hashes_and_compresses(collected_static):
+    name = staticfiles_storage.stored_name("css/bootstrap.min.css")
+    assert name != "css/bootstrap.min.css", (
+        "Убедитесь, что статика получает имена с хешем содержимого."
+    )
+    original = (collected_static / name).read_bytes()
+    compressed = collected_static / f"{name}.gz"
+    assert compressed.exists() and gzip.decompress(
+        compressed.read_bytes()
+    ) == original, (
+        "Убедитесь, что при collectstatic создаются сжатые копии `.gz`."
+    )
+
+
+@pytest.mark.django_db
+def test_middleware_serves_hashed_files(collected_static, rf):
+    middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+    url = staticfiles_storage.url("css/bootstrap.min.css")
+    response = middleware(rf.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate"))
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем в имени отдаются с долгим "
+        "кэшированием."
+    )
+    assert "Accept-Encoding" in response["Vary"]
+    response.close()
+    revalidated = middleware(
+        rf.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    )
+    assert revalidated.status_code == 304
+    assert middleware(rf.get("/")).content == b"app"
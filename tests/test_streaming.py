@@ -0,0 +1,27 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+@override_settings(STREAMING_PAGES=True, STREAMING_CHUNK_SIZE=2)
+def test_post_detail_streaming(mixer, user_client, comment_to_a_post):
+    post = comment_to_a_post.post
+    more_comments = mixer.cycle(4).blend("blog.Comment", post=post)
+    response = user_client.get(f"/posts/{post.id}/")
+    assert response.streaming, (
+        "Убедитесь, что при включённом STREAMING_PAGES страница поста "
+        "отдаётся потоковым ответом."
+    )
+    chunks = [chunk.decode() for chunk in response.streaming_content]
+    assert "<header>" in chunks[0] and post.title in chunks[0], (
+        "Убедитесь, что шапка страницы и пост отдаются первым фрагментом."
+    )
+    content = "".join(chunks)
+    for comment in [comment_to_a_post, *more_comments]:
+        assert f'name="comment_{comment.id}"' in content, (
+            "Убедитесь, что в потоковом режиме выводятся все комментарии."
+        )
+    assert len(chunks) == 5 and content.rstrip().endswith("</html>"), (
+        "Убедитесь, что комментарии отдаются порциями между шапкой "
+        "и подвалом страницы."
+    )
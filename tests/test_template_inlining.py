@@ -0,0 +1,42 @@
+import copy
+
+import pytest
+from django.template import engines
+
+from blog.template_loaders import InliningLoader
+
+
+def inlined_source(template_name):
+    engine = engines["django"].engine
+    loader = InliningLoader(engine, engine.loaders)
+    origin = next(loader.get_template_sources(template_name))
+    return loader.get_contents(origin)
+
+
+def test_static_includes_are_inlined():
+    card = inlined_source("includes/post_card.html")
+    assert "{% include" not in card and "post.category.url" in card, (
+        "Убедитесь, что статические include подставляются в шаблон "
+        "при компиляции."
+    )
+    assert '{% include "includes/post_card.html" %}' not in inlined_source(
+        "blog/post_list.html"
+    )
+
+
+@pytest.mark.django_db
+def test_inlined_feed_renders_same_html(
+        settings, client, post_with_published_location):
+    inlined = client.get("/").content
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["OPTIONS"]["loaders"] = [(
+        "blog.template_loaders.MinifyingLoader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    )]
+    settings.TEMPLATES = templates
+    assert client.get("/").content == inlined, (
+        "Убедитесь, что подстановка include не меняет HTML страницы."
+    )
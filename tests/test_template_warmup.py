@@ -0,0 +1,53 @@
+import copy
+import logging
+
+from django.core.management import call_command
+from django.template import engines
+
+from blog.template_loaders import warm_templates, warm_up
+
+
+def test_warm_templates_fills_cached_loader(settings):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = templates[0]["OPTIONS"]["loaders"]
+    if loaders[0][0] != "django.template.loaders.cached.Loader":
+        templates[0]["OPTIONS"]["loaders"] = [
+            ("django.template.loaders.cached.Loader", loaders)
+        ]
+    settings.TEMPLATES = templates
+    results = warm_templates()
+    names = {name for name, _, _ in results}
+    assert {"blog/post_list.html", "includes/post_card.html"} <= names
+    assert not any(name.startswith("admin/") for name in names), (
+        "Убедитесь, что прогреваются только шаблоны проекта."
+    )
+    assert not [error for _, _, error in results if error], (
+        "Убедитесь, что все шаблоны проекта компилируются без ошибок."
+    )
+    cached_loader = engines["django"].engine.template_loaders[0]
+    assert "includes/post_card.html" in {
+        key.split("-")[0] for key in cached_loader.get_template_cache
+    }, "Убедитесь, что прогрев заполняет кэш cached.Loader."
+
+
+def test_warm_templates_command(capsys):
+    call_command("warm_templates", slowest=3)
+    assert "Шаблонов:" in capsys.readouterr().out
+
+
+def test_warm_up_logs_and_skips_broken_templates(monkeypatch, caplog):
+    engine = engines["django"].engine
+    get_template = engine.get_template
+
+    def broken(name):
+        if name == "includes/post_card.html":
+            raise OSError("нет доступа")
+        return get_template(name)
+
+    monkeypatch.setattr(engine, "get_template", broken)
+    with caplog.at_level(logging.WARNING, logger="blog.templates"):
+        warm_up()
+    assert "includes/post_card.html не прогрет: OSError" in caplog.text, (
+        "Убедитесь, что ошибка загрузки шаблона пишется в лог и не "
+        "останавливает запуск воркера."
+    )
@@ -0,0 +1,147 @@
+import pickle
+
+import pytest
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import connection
+from django.http import Http404
+from django.test.utils import CaptureQueriesContext
+
+from blog.caching import USER_KEY, get_cached_user, get_profile_or_404
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path),
+    }}
+
+
+def user_queries(client):
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/")
+    return [
+        query for query in queries.captured_queries
+        if 'FROM "auth_user"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_authenticated_page_skips_user_query(shared_cache, user_client):
+    user_client.get("/")
+    assert not user_queries(user_client), (
+        "Убедитесь, что пользователь сессии берётся из кэша, "
+        "а не запрашивается из БД на каждой странице."
+    )
+    assert user_client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что сессия пользователя из кэша проходит проверку."
+    )
+
+
+@pytest.mark.django_db
+def test_per_process_cache_is_not_used_for_sessions(user_client):
+    user_client.get("/")
+    assert user_queries(user_client), (
+        "Убедитесь, что с кэшем своим у каждого процесса пользователь "
+        "сессии читается из БД."
+    )
+
+
+@pytest.mark.django_db
+def test_password_is_not_cached(shared_cache, user):
+    get_cached_user(user.pk)
+    assert user.password not in str(pickle.dumps(
+        cache.get(USER_KEY.format(user.pk))
+    )), "Убедитесь, что хэш пароля не попадает в кэш."
+    password = user.password
+    cached = get_cached_user(user.pk)
+    assert cached.get_session_auth_hash() == user.get_session_auth_hash()
+    cached.first_name = "Новое имя"
+    cached.save()
+    user.refresh_from_db()
+    assert user.first_name == "Новое имя" and user.password == password, (
+        "Убедитесь, что сохранение пользователя из кэша не меняет пароль."
+    )
+
+
+@pytest.mark.django_db
+def test_user_cache_invalidated_on_save(shared_cache, user):
+    old_username = user.username
+    assert get_cached_user(user.pk).username == old_username
+    assert get_profile_or_404(old_username) == user
+    user.username = f"{old_username}_renamed"
+    user.set_password("new-password")
+    with CaptureQueriesContext(connection) as queries:
+        user.save()
+    assert len(queries) == 1, "Убедитесь, что сохранение не делает SELECT."
+    cached = get_cached_user(user.pk)
+    assert cached.username == user.username
+    assert cached.get_session_auth_hash() == user.get_session_auth_hash(), (
+        "Убедитесь, что кэш пользователя сбрасывается при сохранении "
+        "профиля и смене пароля."
+    )
+    with pytest.raises(Http404):
+        get_profile_or_404(old_username)
+
+
+@pytest.mark.django_db
+def test_password_change_keeps_session(shared_cache, user_client, user):
+    user_client.get("/")
+    user.set_password("old-password")
+    user.save()
+    user_client.force_login(user)
+    user_client.get("/")
+    response = user_client.post("/auth/password_change/", {
+        "old_password": "old-password",
+        "new_password1": "N3w-Pa55word!",
+        "new_password2": "N3w-Pa55word!",
+    })
+    assert response.status_code == 302
+    assert user_client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что после смены пароля сессия остаётся действительной."
+    )
+
+
+@pytest.mark.django_db
+def test_failed_login_checks_password_once(monkeypatch, user):
+    calls = []
+    original = ModelBackend.authenticate
+
+    def counted(self, *args, **kwargs):
+        calls.append(type(self))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ModelBackend, "authenticate", counted)
+    assert authenticate(username=user.username, password="wrong") is None
+    assert authenticate(username="missing", password="wrong") is None
+    assert len(calls) == 2, (
+        "Убедитесь, что неудачный вход проверяет пароль одним бэкендом."
+    )
+
+
+@pytest.mark.django_db
+def test_legacy_session_backend_is_accepted(shared_cache, user_client):
+    session = user_client.session
+    session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+    session.save()
+    assert user_client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что сессии, созданные до включения кэша, "
+        "остаются действительными."
+    )
+    assert user_client.session[BACKEND_SESSION_KEY] == (
+        "blog.backends.CachedModelBackend"
+    )
+    assert not user_queries(user_client)
+
+
+@pytest.mark.django_db
+def test_per_process_cache_is_not_used_for_profiles(user):
+    get_profile_or_404(user.username)
+    with CaptureQueriesContext(connection) as queries:
+        assert get_profile_or_404(user.username) == user
+    assert len(queries) == 1, (
+        "Убедитесь, что с кэшем своим у каждого процесса профиль "
+        "читается из БД."
+    )